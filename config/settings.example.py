@@ -3,9 +3,14 @@
 請複製此檔案並重命名為 settings.py，然後設定你的 Discord Webhook URL
 """
 
-import json
+import contextlib
+import copy
+import hashlib
+import mmap
 import os
 
+import orjson
+
 # 取得配置檔案路徑
 CONFIG_DIR = os.path.dirname(os.path.abspath(__file__))
 STOCKS_FILE = os.path.join(CONFIG_DIR, "stocks.json")
@@ -17,11 +22,38 @@ DISCORD_WEBHOOK_URL = "YOUR_DISCORD_WEBHOOK_URL_HERE"
 FRED_API_KEY = os.environ.get("FRED_API_KEY", "")
 
 
+# 程序內快取：檔案未變動時直接回傳已解析的設定
+# mtime 未變時不讀檔；mtime 變動但內容雜湊相同時 (如重新產生相同內容) 不重新解析
+_markets_cache = None
+_markets_mtime = None
+_markets_digest = None
+
+
+def _digest(data) -> str:
+    """設定檔內容雜湊"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
 def load_markets():
     """從 JSON 檔案載入市場與股票設定"""
+    global _markets_cache, _markets_mtime, _markets_digest
+
     if os.path.exists(STOCKS_FILE):
-        with open(STOCKS_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        mtime = os.stat(STOCKS_FILE).st_mtime_ns
+        if _markets_cache is not None and mtime == _markets_mtime:
+            return _markets_cache
+
+        with open(STOCKS_FILE, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    digest = _digest(view)
+                    if _markets_cache is not None and digest == _markets_digest:
+                        _markets_mtime = mtime
+                        return _markets_cache
+                    markets = orjson.loads(view)
+
+        _markets_cache, _markets_mtime, _markets_digest = markets, mtime, digest
+        return markets
     else:
         # 預設配置（當 JSON 檔案不存在時）
         return {
@@ -40,11 +72,44 @@ def load_markets():
 
 def save_markets(markets):
     """儲存市場與股票設定到 JSON 檔案"""
-    with open(STOCKS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(markets, f, ensure_ascii=False, indent=2)
+    global _markets_cache, _markets_mtime, _markets_digest
+
+    data = orjson.dumps(markets, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+
+    # 先寫入暫存檔再替換，避免寫入中斷造成設定檔損毀
+    tmp_file = f"{STOCKS_FILE}.tmp"
+    with open(tmp_file, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_file, STOCKS_FILE)
+
+    _markets_cache = markets
+    _markets_mtime = os.stat(STOCKS_FILE).st_mtime_ns
+    _markets_digest = _digest(data)
+
+
+def _load_for_edit():
+    """載入可修改的設定副本 (不直接改動共用快取，儲存成功後才成為新的快取)"""
+    return copy.deepcopy(load_markets())
 
 
-def add_stock(market: str, sector: str, symbol: str):
+@contextlib.contextmanager
+def markets_transaction():
+    """
+    批次修改市場設定：區塊開始時載入一次，結束時儲存一次
+
+    區塊內修改的是設定副本；發生例外時不會儲存，程序內快取也維持原狀。
+
+    Example:
+        with markets_transaction() as markets:
+            add_stock("TW", "半導體", "2330.TW", markets=markets)
+            add_stock("TW", "半導體", "2454.TW", markets=markets)
+    """
+    markets = _load_for_edit()
+    yield markets
+    save_markets(markets)
+
+
+def add_stock(market: str, sector: str, symbol: str, markets: dict = None):
     """
     新增股票到指定類股
 
@@ -52,19 +117,23 @@ def add_stock(market: str, sector: str, symbol: str):
         market: "TW" 或 "US"
         sector: 類股名稱
         symbol: 股票代碼
+        markets: 已載入的設定 (於 markets_transaction 內使用，不會自行儲存)
     """
-    markets = load_markets()
+    autosave = markets is None
+    if autosave:
+        markets = _load_for_edit()
     if market in markets:
         if sector not in markets[market]["sectors"]:
             markets[market]["sectors"][sector] = []
         if symbol not in markets[market]["sectors"][sector]:
             markets[market]["sectors"][sector].append(symbol)
-            save_markets(markets)
+            if autosave:
+                save_markets(markets)
             return True
     return False
 
 
-def remove_stock(market: str, sector: str, symbol: str):
+def remove_stock(market: str, sector: str, symbol: str, markets: dict = None):
     """
     從指定類股移除股票
 
@@ -72,17 +141,21 @@ def remove_stock(market: str, sector: str, symbol: str):
         market: "TW" 或 "US"
         sector: 類股名稱
         symbol: 股票代碼
+        markets: 已載入的設定 (於 markets_transaction 內使用，不會自行儲存)
     """
-    markets = load_markets()
+    autosave = markets is None
+    if autosave:
+        markets = _load_for_edit()
     if market in markets and sector in markets[market]["sectors"]:
         if symbol in markets[market]["sectors"][sector]:
             markets[market]["sectors"][sector].remove(symbol)
-            save_markets(markets)
+            if autosave:
+                save_markets(markets)
             return True
     return False
 
 
-def add_sector(market: str, sector: str, stocks: list = None):
+def add_sector(market: str, sector: str, stocks: list = None, markets: dict = None):
     """
     新增類股
 
@@ -90,27 +163,35 @@ def add_sector(market: str, sector: str, stocks: list = None):
         market: "TW" 或 "US"
         sector: 類股名稱
         stocks: 股票代碼列表
+        markets: 已載入的設定 (於 markets_transaction 內使用，不會自行儲存)
     """
-    markets = load_markets()
+    autosave = markets is None
+    if autosave:
+        markets = _load_for_edit()
     if market in markets:
         markets[market]["sectors"][sector] = stocks or []
-        save_markets(markets)
+        if autosave:
+            save_markets(markets)
         return True
     return False
 
 
-def remove_sector(market: str, sector: str):
+def remove_sector(market: str, sector: str, markets: dict = None):
     """
     移除類股
 
     Args:
         market: "TW" 或 "US"
         sector: 類股名稱
+        markets: 已載入的設定 (於 markets_transaction 內使用，不會自行儲存)
     """
-    markets = load_markets()
+    autosave = markets is None
+    if autosave:
+        markets = _load_for_edit()
     if market in markets and sector in markets[market]["sectors"]:
         del markets[market]["sectors"][sector]
-        save_markets(markets)
+        if autosave:
+            save_markets(markets)
         return True
     return False
 
@@ -5,19 +5,37 @@
 """
 
 import sys
+import atexit
+import queue
+import asyncio
 import argparse
-import schedule
-import time
 from datetime import datetime
 import logging
+from logging.handlers import QueueHandler, QueueListener
+
+from apscheduler.schedulers.blocking import BlockingScheduler
+from apscheduler.triggers.cron import CronTrigger
 
 # 設定日誌
+# 檔案寫入交由背景執行緒處理，避免磁碟 I/O 阻塞分析流程
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+_log_queue = queue.Queue(-1)
+_file_handler = logging.FileHandler('stock_bot.log', encoding='utf-8')
+_file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+_log_listener = QueueListener(_log_queue, _file_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+# QueueHandler 只合併訊息參數，完整格式由檔案 handler 套用，避免重複前綴
+_queue_handler = QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
+
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    format=LOG_FORMAT,
     handlers=[
         logging.StreamHandler(),
-        logging.FileHandler('stock_bot.log', encoding='utf-8')
+        _queue_handler
     ]
 )
 logger = logging.getLogger(__name__)
@@ -28,7 +46,7 @@ from modules.data_fetcher import DataFetcher
 from modules.market_analyzer import MarketAnalyzer
 from modules.sector_scanner import SectorScanner
 from modules.predictor import TrendPredictor
-from modules.discord_bot import DiscordNotifier
+from modules.discord_bot import DiscordNotifier, TIMESTAMP_FORMAT
 from modules.stock_discovery import StockDiscovery
 from modules.macro_fetcher import MacroFetcher
 from modules.cycle_analyzer import CycleAnalyzer
@@ -121,6 +139,26 @@ class StockBot:
             "buy_signals": buy_signals
         }
 
+    async def _analyze_markets(self, market: str):
+        """
+        並行分析台股與美股 (兩者皆以網路 I/O 為主)
+
+        Args:
+            market: 市場選擇 ("tw", "us", "all")
+
+        Returns:
+            (台股結果, 美股結果)，未選擇的市場為 None
+        """
+        tw_task = (
+            asyncio.to_thread(self.analyze_taiwan_market)
+            if market in ["tw", "all"] else asyncio.sleep(0, result=None)
+        )
+        us_task = (
+            asyncio.to_thread(self.analyze_us_market)
+            if market in ["us", "all"] else asyncio.sleep(0, result=None)
+        )
+        return await asyncio.gather(tw_task, us_task)
+
     def run_analysis(self, market: str = "all"):
         """
         執行市場分析
@@ -131,15 +169,7 @@ class StockBot:
         logger.info(f"執行 {market} 市場分析...")
 
         try:
-            if market in ["tw", "all"]:
-                tw_result = self.analyze_taiwan_market()
-            else:
-                tw_result = None
-
-            if market in ["us", "all"]:
-                us_result = self.analyze_us_market()
-            else:
-                us_result = None
+            tw_result, us_result = asyncio.run(self._analyze_markets(market))
 
             # 動態發現
             discoveries = {}
@@ -176,6 +206,10 @@ class StockBot:
         Args:
             market: 市場選擇 ("tw", "us", "all")
         """
+        if not self.notifier.enabled:
+            logger.warning("Discord Webhook URL 尚未設定，略過每日報告")
+            return
+
         logger.info("開始產生每日報告...")
 
         try:
@@ -199,58 +233,63 @@ class StockBot:
             # 按強度排序
             all_top_stocks.sort(key=lambda x: x.strength_score, reverse=True)
 
-            # 發送報告開頭和主體內容
-            now = datetime.now().strftime("%Y-%m-%d")
-            self.notifier.send_message(content=f"# 📈 {now} 每日股市分析報告\n---")
-            
-            # 發送台股相關分析
+            # 持倉評估先行計算，失敗時略過該段報告
+            portfolio_summary = None
+            if self.enable_portfolio and self.portfolio_analyzer:
+                try:
+                    portfolio_summary = self.portfolio_analyzer.analyze()
+                except FileNotFoundError:
+                    logger.info("未找到 holdings.json，跳過持倉評估")
+                except Exception as e:
+                    logger.warning(f"持倉評估失敗: {e}")
+
+            # 整份報告使用同一個更新時間
+            now = datetime.now()
+            now_str = now.strftime(TIMESTAMP_FORMAT)
+
+            # 依報告順序整理主體訊息
+            jobs = []
+
+            # 台股相關分析
             if tw_index:
-                self.notifier.send_market_analysis({"^TWII": tw_index}, "台股")
+                jobs.append((self.notifier.send_market_analysis, ({"^TWII": tw_index}, "台股", now_str)))
             if tw_sectors:
-                self.notifier.send_sector_analysis(tw_sectors, "台股")
+                jobs.append((self.notifier.send_sector_analysis, (tw_sectors, "台股", now_str)))
             if tw_outlook:
-                self.notifier.send_market_outlook(tw_outlook)
-                
-            # 發送美股相關分析
+                jobs.append((self.notifier.send_market_outlook, (tw_outlook, now_str)))
+
+            # 美股相關分析
             if us_indices:
-                self.notifier.send_market_analysis(us_indices, "美股")
+                jobs.append((self.notifier.send_market_analysis, (us_indices, "美股", now_str)))
             if us_sectors:
-                self.notifier.send_sector_analysis(us_sectors, "美股")
+                jobs.append((self.notifier.send_sector_analysis, (us_sectors, "美股", now_str)))
             if us_outlook:
-                self.notifier.send_market_outlook(us_outlook)
-            
-            # 發送景氣循環分析
+                jobs.append((self.notifier.send_market_outlook, (us_outlook, now_str)))
+
+            # 景氣循環分析
             cycle = result.get("cycle")
             if cycle:
-                self.notifier.send_cycle_analysis(cycle)
-                
-            # 發送強勢個股推薦
+                jobs.append((self.notifier.send_cycle_analysis, (cycle, now_str)))
+
+            # 強勢個股推薦
             if all_top_stocks:
-                self.notifier.send_stock_recommendations(all_top_stocks[:10], "今日強勢個股")
-                
-            # 發送動態發現報告
+                jobs.append((self.notifier.send_stock_recommendations, (all_top_stocks[:10], "今日強勢個股", now_str)))
+
+            # 動態發現報告
             discoveries = result.get("discoveries", {})
             if discoveries:
-                self.notifier.send_discovery_report(discoveries)
-                
-            # 發送持倉評估報告
-            if self.enable_portfolio and self.portfolio_analyzer:
-                try:
-                    portfolio_summary = self.portfolio_analyzer.analyze()
-                    self.notifier.send_portfolio_report(portfolio_summary)
-                except FileNotFoundError:
-                    logger.info("未找到 holdings.json，跳過持倉評估")
-                except Exception as e:
-                    logger.warning(f"持倉評估失敗: {e}")
+                jobs.append((self.notifier.send_discovery_report, (discoveries, now_str)))
+
+            # 持倉評估報告
+            if portfolio_summary is not None:
+                jobs.append((self.notifier.send_portfolio_report, (portfolio_summary,)))
+
+            # 開頭先發送，主體並行建構後依序發送，完成後才發送結尾
+            self.notifier.send_report_header(now.strftime("%Y-%m-%d"))
+            self.notifier.send_concurrently(jobs)
 
             # 最後發送免責聲明
-            self.notifier.send_message(
-                content=(
-                    "---\n"
-                    "⚠️ **免責聲明**: 以上分析僅供參考，不構成投資建議。\n"
-                    "投資有風險，請依個人風險承受度審慎評估。"
-                )
-            )
+            self.notifier.send_disclaimer()
             
             logger.info("每日報告發送完成")
 
@@ -267,6 +306,10 @@ class StockBot:
         Args:
             market: 市場選擇
         """
+        if not self.notifier.enabled:
+            logger.warning("Discord Webhook URL 尚未設定，略過快速更新")
+            return
+
         logger.info("發送快速更新...")
 
         try:
@@ -287,43 +330,46 @@ class StockBot:
         except Exception as e:
             logger.error(f"快速更新失敗: {e}")
 
+    def _register_daily_report(
+        self,
+        scheduler: BlockingScheduler,
+        days: str,
+        time_str: str,
+        market: str
+    ):
+        """
+        註冊每日報告排程
+
+        Args:
+            scheduler: 排程器
+            days: 執行星期 (cron 格式，如 "mon-fri")
+            time_str: 執行時間 "HH:MM"
+            market: 市場選擇 ("tw", "us")
+        """
+        hour, minute = map(int, time_str.split(":"))
+        scheduler.add_job(
+            self.send_daily_report,
+            CronTrigger(day_of_week=days, hour=hour, minute=minute,
+                        timezone=SCHEDULE["timezone"]),
+            kwargs={"market": market},
+        )
+
     def start_scheduler(self):
         """啟動排程器"""
         logger.info("啟動排程器...")
 
-        # 台股收盤後分析 (台灣時間 14:30)
-        schedule.every().monday.at(SCHEDULE["tw_market_close"]).do(
-            self.send_daily_report, market="tw"
-        )
-        schedule.every().tuesday.at(SCHEDULE["tw_market_close"]).do(
-            self.send_daily_report, market="tw"
-        )
-        schedule.every().wednesday.at(SCHEDULE["tw_market_close"]).do(
-            self.send_daily_report, market="tw"
-        )
-        schedule.every().thursday.at(SCHEDULE["tw_market_close"]).do(
-            self.send_daily_report, market="tw"
-        )
-        schedule.every().friday.at(SCHEDULE["tw_market_close"]).do(
-            self.send_daily_report, market="tw"
+        # 排程器直接休眠至下一個觸發時間；若喚醒延遲 (如主機休眠)，
+        # 5 分鐘內仍補執行一次，而非預設的 1 秒寬限即放棄
+        scheduler = BlockingScheduler(
+            timezone=SCHEDULE["timezone"],
+            job_defaults={"coalesce": True, "misfire_grace_time": 300},
         )
 
+        # 台股收盤後分析 (台灣時間 14:30)
+        self._register_daily_report(scheduler, "mon-fri", SCHEDULE["tw_market_close"], "tw")
+
         # 美股收盤後分析 (台灣時間約 05:30，次日執行)
-        schedule.every().tuesday.at(SCHEDULE["us_market_close"]).do(
-            self.send_daily_report, market="us"
-        )
-        schedule.every().wednesday.at(SCHEDULE["us_market_close"]).do(
-            self.send_daily_report, market="us"
-        )
-        schedule.every().thursday.at(SCHEDULE["us_market_close"]).do(
-            self.send_daily_report, market="us"
-        )
-        schedule.every().friday.at(SCHEDULE["us_market_close"]).do(
-            self.send_daily_report, market="us"
-        )
-        schedule.every().saturday.at(SCHEDULE["us_market_close"]).do(
-            self.send_daily_report, market="us"
-        )
+        self._register_daily_report(scheduler, "tue-sat", SCHEDULE["us_market_close"], "us")
 
         logger.info("排程設定完成")
         logger.info(f"  台股分析時間: 週一至週五 {SCHEDULE['tw_market_close']}")
@@ -334,10 +380,11 @@ class StockBot:
             content="🤖 **股市推播機器人已啟動**\n自動排程分析已開始運行"
         )
 
-        # 執行排程
-        while True:
-            schedule.run_pending()
-            time.sleep(60)
+        # 執行排程 (阻塞直到程序結束)
+        try:
+            scheduler.start()
+        except (KeyboardInterrupt, SystemExit):
+            logger.info("排程器已停止")
 
     def print_analysis(self, market: str = "all"):
         """
@@ -12,6 +12,7 @@ from config.settings import (
     load_markets, save_markets,
     add_stock, remove_stock,
     add_sector, remove_sector,
+    markets_transaction,
     STOCKS_FILE
 )
 
@@ -141,18 +142,24 @@ def interactive_add_sector():
 
     stocks_input = input("股票代碼 (用逗號分隔，可留空): ").strip()
 
-    stocks = []
-    if stocks_input:
-        for s in stocks_input.split(","):
-            symbol = s.strip().upper()
-            if market == "TW" and not symbol.endswith(".TW"):
-                symbol = f"{symbol}.TW"
-            stocks.append(symbol)
-
-    if add_sector(market, sector, stocks):
-        print(f"✅ 已新增類股 {sector}，包含 {len(stocks)} 檔股票")
-    else:
-        print(f"❌ 新增失敗")
+    # 在單一交易中建立完整類股，只讀寫設定檔一次
+    with markets_transaction() as markets:
+        if not add_sector(market, sector, markets=markets):
+            print(f"❌ 新增失敗")
+            return
+
+        added = 0
+        if stocks_input:
+            for s in stocks_input.split(","):
+                symbol = s.strip().upper()
+                if not symbol:
+                    continue
+                if market == "TW" and not symbol.endswith(".TW"):
+                    symbol = f"{symbol}.TW"
+                if add_stock(market, sector, symbol, markets=markets):
+                    added += 1
+
+    print(f"✅ 已新增類股 {sector}，包含 {added} 檔股票")
 
 
 def interactive_remove_sector():
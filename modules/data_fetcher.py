@@ -3,23 +3,413 @@
 使用 yfinance 從 Yahoo Finance 獲取股票數據
 """
 
+import os
+import shutil
+import asyncio
+import requests
 import yfinance as yf
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+import threading
+import time
 import logging
 
+import orjson
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow 為可選依賴，缺少時僅停用磁碟快取
+    pa = None
+    pc = None
+    ds = None
+    pq = None
+
+try:
+    from curl_cffi import requests as curl_requests
+except ImportError:  # curl_cffi 為可選依賴，缺少時改用 requests Session
+    curl_requests = None
+
+try:
+    from yfinance.exceptions import YFRateLimitError
+except ImportError:  # 舊版 yfinance 無此例外，限流錯誤改由一般錯誤處理
+    class YFRateLimitError(Exception):
+        """舊版 yfinance 的替代定義 (不會被拋出)"""
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 磁碟快取預設位置
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "stockbot"
+
+# yf.download 舊版以模組層級全域狀態彙整結果，並行呼叫需序列化
+_download_lock = threading.Lock()
+
+# get_stock_arrays 輸出的欄位
+OHLCV_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+
+# 可由本地歷史資料集切片的時間範圍 (僅日線)，其餘 period/interval 直接向 Yahoo 查詢
+HISTORY_INTERVALS = ("1d",)
+HISTORY_PERIODS = {
+    "1mo": pd.DateOffset(months=1),
+    "3mo": pd.DateOffset(months=3),
+    "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1),
+    "2y": pd.DateOffset(years=2),
+    "5y": pd.DateOffset(years=5),
+    "10y": pd.DateOffset(years=10),
+}
+# 資料集起始日晚於範圍起點多久內仍視為涵蓋 (長假休市可能超過一週)
+HISTORY_GAP_TOLERANCE = pd.Timedelta(days=10)
+# 資料集片段數超過此值時合併為單一檔案
+HISTORY_MAX_FRAGMENTS = 16
+
+# 股票名稱幾乎不變，持久化保存以免每次啟動都逐檔查詢 Ticker.info
+NAME_CACHE_TTL = timedelta(days=7)
+
 
 class DataFetcher:
     """股票數據抓取器"""
 
-    def __init__(self):
-        self.cache = {}
-        self.cache_expiry = {}
+    def __init__(
+        self,
+        max_workers: int = 16,
+        cache_dir: Optional[str] = None,
+        disk_budget_mb: int = 256,
+        use_disk_cache: bool = True
+    ):
+        """
+        初始化數據抓取器
+
+        Args:
+            max_workers: 批量抓取時的最大並行執行緒數
+            cache_dir: 磁碟快取目錄 (預設 ~/.cache/stockbot)
+            disk_budget_mb: 磁碟快取容量上限 (MB)，超過時淘汰最久未使用的檔案
+            use_disk_cache: 是否啟用磁碟快取 (需安裝 pyarrow)
+        """
         self.cache_duration = timedelta(minutes=15)
+        self.cache = TTLCache(maxsize=512, ttl=self.cache_duration.total_seconds())
+        # 基本資訊/即時報價使用較短的快取時間
+        self.info_cache = TTLCache(maxsize=512, ttl=60)
+        # OHLCV float32 陣列快取 (get_stock_arrays)
+        self.array_cache = TTLCache(maxsize=512, ttl=self.cache_duration.total_seconds())
+        self.max_workers = max_workers
+        self._cache_lock = threading.Lock()
+        self.session = self._create_session()
+        # Ticker 物件會在內部保留 info/fast_info 結果，存活時間與報價快取一致
+        self._tickers = TTLCache(maxsize=512, ttl=60)
+
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        # 各股日線歷史資料集 (append-only)，不計入 disk_budget
+        self.history_dir = self.cache_dir / "history"
+        self._history_lock = threading.Lock()
+        # 股票名稱快取 {代碼: [名稱, 寫入時間]}，首次使用時由磁碟載入
+        self.names_path = self.cache_dir / "names.json"
+        self._names: Optional[Dict[str, list]] = None
+        # 進行中的歷史數據請求，同一快取鍵的並行呼叫共用同一次下載
+        self._inflight: Dict[str, Future] = {}
+        # 最近一次下載遭 Yahoo 限流 (429) 的快取鍵，由 consume_rate_limit 取出
+        self._rate_limited: Set[str] = set()
+        self.disk_budget = disk_budget_mb * 1024 * 1024
+        self.use_disk_cache = use_disk_cache and pq is not None
+        if self.use_disk_cache:
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+            except OSError as e:
+                logger.warning("無法建立快取目錄 %s: %s", self.cache_dir, e)
+                self.use_disk_cache = False
+
+    def _create_session(self):
+        """
+        建立共用 HTTP Session
+
+        有安裝 curl_cffi 時使用模擬 Chrome TLS 指紋的 Session，避免 Yahoo 的
+        crumb/cookie 驗證反覆 401/429；限流由呼叫端退避處理，傳輸層不再重試。
+        否則使用 requests Session (keep-alive 連線池，並對暫時性錯誤重試)。
+        """
+        if curl_requests is not None:
+            return curl_requests.Session(impersonate="chrome")
+
+        session = requests.Session()
+        retry = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+        )
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=max(32, self.max_workers),
+            max_retries=retry,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _ticker(self, symbol: str) -> yf.Ticker:
+        """取得 (並快取) 股票的 Ticker 物件，避免重複初始化"""
+        with self._cache_lock:
+            ticker = self._tickers.get(symbol)
+            if ticker is None:
+                ticker = yf.Ticker(symbol, session=self.session)
+                self._tickers[symbol] = ticker
+        return ticker
+
+    def _disk_path(self, cache_key: str) -> Path:
+        """快取鍵對應的 parquet 檔案路徑"""
+        return self.cache_dir / f"{cache_key}.parquet"
+
+    def _load_from_disk(self, cache_key: str) -> Optional[pd.DataFrame]:
+        """從磁碟讀取未過期的快取 (mmap 零拷貝讀取)"""
+        if not self.use_disk_cache:
+            return None
+
+        path = self._disk_path(cache_key)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+
+        written_at = datetime.fromtimestamp(stat.st_mtime)
+        if datetime.now() >= written_at + self.cache_duration:
+            return None
+
+        try:
+            with pa.memory_map(str(path), "r") as source:
+                df = pq.read_table(source).to_pandas()
+            # 更新存取時間供 LRU 淘汰使用，保留 mtime 作為寫入時間
+            os.utime(path, (datetime.now().timestamp(), stat.st_mtime))
+        except Exception as e:
+            logger.warning("讀取磁碟快取失敗 %s: %s", path.name, e)
+            return None
+
+        with self._cache_lock:
+            self.cache[cache_key] = df
+        return df
+
+    def _save_to_disk(self, cache_key: str, df: pd.DataFrame):
+        """寫入磁碟快取並依容量上限淘汰舊檔"""
+        if not self.use_disk_cache:
+            return
+
+        path = self._disk_path(cache_key)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            df.to_parquet(tmp_path, compression="zstd")
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning("寫入磁碟快取失敗 %s: %s", path.name, e)
+            tmp_path.unlink(missing_ok=True)
+            return
+
+        self._evict_disk_cache()
+
+    def _evict_disk_cache(self):
+        """磁碟快取超過容量上限時，依最後存取時間淘汰"""
+        try:
+            entries = [(p, p.stat()) for p in self.cache_dir.glob("*.parquet")]
+        except OSError:
+            return
+
+        total = sum(st.st_size for _, st in entries)
+        if total <= self.disk_budget:
+            return
+
+        for path, st in sorted(entries, key=lambda e: e[1].st_atime):
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= st.st_size
+            logger.debug("淘汰磁碟快取: %s", path.name)
+            if total <= self.disk_budget:
+                break
+
+    def _get_cached(self, cache_key: str) -> Optional[pd.DataFrame]:
+        """讀取未過期的快取數據 (記憶體優先，其次磁碟)"""
+        with self._cache_lock:
+            df = self.cache.get(cache_key)
+        if df is not None:
+            return df
+        return self._load_from_disk(cache_key)
+
+    def _set_cached(self, cache_key: str, df: pd.DataFrame):
+        """寫入快取數據"""
+        with self._cache_lock:
+            self.cache[cache_key] = df
+        self._save_to_disk(cache_key, df)
+
+    def _history_path(self, symbol: str, interval: str) -> Path:
+        """股票歷史資料集目錄 (hive 分區: interval=<interval>/symbol=<symbol>)"""
+        return self.history_dir / f"interval={interval}" / f"symbol={symbol}"
+
+    def _read_history(
+        self,
+        symbol: str,
+        interval: str,
+        since: pd.Timestamp
+    ) -> Optional[pd.DataFrame]:
+        """
+        從歷史資料集讀取 since 之後的數據
+
+        以 pyarrow.dataset 依 Date 欄位過濾，未涵蓋範圍的 row group 不會被讀取。
+        片段依寫入順序讀取，同一日期以較新的片段為準。
+
+        Args:
+            symbol: 股票代碼
+            interval: 時間間隔
+            since: 起始時間 (含，未帶時區時視為資料集時區)
+
+        Returns:
+            依日期排序的 DataFrame，資料集不存在或讀取失敗時為 None
+        """
+        paths = sorted(str(p) for p in self._history_path(symbol, interval).glob("part-*.parquet"))
+        if not paths:
+            return None
+
+        try:
+            dataset = ds.dataset(paths, format="parquet")
+            tz = dataset.schema.field("Date").type.tz
+            if tz and since.tz is None:
+                since = since.tz_localize(tz)
+            date_filter = pc.field("Date") >= pa.scalar(since)
+            frames = [
+                fragment.to_table(filter=date_filter, schema=fragment.physical_schema).to_pandas()
+                for fragment in dataset.get_fragments(filter=date_filter)
+            ]
+        except Exception as e:
+            logger.warning("讀取歷史資料集失敗 %s: %s", symbol, e)
+            return None
+
+        frames = [f for f in frames if not f.empty]
+        if not frames:
+            return None
+        df = pd.concat(frames) if len(frames) > 1 else frames[0]
+        df = df[~df.index.duplicated(keep="last")]
+        return df.sort_index()
+
+    def _write_history(
+        self,
+        symbol: str,
+        interval: str,
+        df: pd.DataFrame,
+        replace: bool = False
+    ):
+        """
+        將數據寫入歷史資料集的新片段
+
+        Args:
+            symbol: 股票代碼
+            interval: 時間間隔
+            df: 要寫入的數據
+            replace: 是否取代既有片段 (重新抓取整段時使用)
+        """
+        path = self._history_path(symbol, interval)
+        with self._history_lock:
+            try:
+                path.mkdir(parents=True, exist_ok=True)
+                old_parts = sorted(path.glob("part-*.parquet"))
+
+                if not replace and len(old_parts) >= HISTORY_MAX_FRAGMENTS:
+                    # 片段過多時與既有數據合併為單一檔案
+                    existing = self._read_history(symbol, interval, pd.Timestamp("1900-01-01"))
+                    if existing is not None:
+                        df = pd.concat([existing, df])
+                        df = df[~df.index.duplicated(keep="last")].sort_index()
+                    replace = True
+
+                part = path / f"part-{time.time_ns():020d}.parquet"
+                tmp_part = part.with_suffix(".tmp")
+                table = pa.Table.from_pandas(df.rename_axis("Date"), preserve_index=True)
+                pq.write_table(table, tmp_part, compression="zstd")
+                os.replace(tmp_part, part)
+
+                if replace:
+                    for old in old_parts:
+                        old.unlink(missing_ok=True)
+            except Exception as e:
+                logger.warning("寫入歷史資料集失敗 %s: %s", symbol, e)
+
+    def _fetch_history(
+        self,
+        symbol: str,
+        period: str,
+        interval: str
+    ) -> pd.DataFrame:
+        """
+        抓取歷史數據，日線且 period 可換算時只向 Yahoo 下載本地資料集之後的增量
+
+        以資料集倒數第二根 K 棒為錨點重新下載 (最後一根可能是盤中數據)，
+        錨點收盤價與本地不符代表除權息/分割調整改寫了歷史價格，改為重新抓取整段。
+
+        Args:
+            symbol: 股票代碼
+            period: 時間範圍
+            interval: 時間間隔
+
+        Returns:
+            只含 OHLCV 欄位的 DataFrame (可能為空)
+        """
+        ticker = self._ticker(symbol)
+        offset = HISTORY_PERIODS.get(period)
+        if not self.use_disk_cache or interval not in HISTORY_INTERVALS or offset is None:
+            return self._select_ohlcv(ticker.history(period=period, interval=interval))
+
+        cutoff = pd.Timestamp.now().normalize() - offset
+        history = self._read_history(symbol, interval, cutoff - HISTORY_GAP_TOLERANCE)
+
+        if history is not None and len(history) >= 2:
+            if history.index.tz is not None:
+                cutoff = cutoff.tz_localize(history.index.tz)
+            if history.index[0] <= cutoff + HISTORY_GAP_TOLERANCE:
+                anchor = history.index[-2]
+                delta = self._select_ohlcv(ticker.history(start=anchor.date(), interval=interval))
+                if (
+                    not delta.empty
+                    and anchor in delta.index
+                    and np.isclose(delta.at[anchor, "Close"], history.at[anchor, "Close"], rtol=1e-6)
+                ):
+                    delta = delta.loc[delta.index > anchor]
+                    if not delta.empty:
+                        self._write_history(symbol, interval, delta)
+                    history = pd.concat([history.loc[history.index <= anchor], delta])
+                    logger.debug("增量更新歷史數據: %s, 新增 %d 筆", symbol, len(delta))
+                    return history.loc[history.index >= cutoff]
+
+        df = self._select_ohlcv(ticker.history(period=period, interval=interval))
+        if not df.empty:
+            self._write_history(symbol, interval, df, replace=True)
+        return df
+
+    @staticmethod
+    def _select_ohlcv(df: pd.DataFrame) -> pd.DataFrame:
+        """只保留分析需要的 OHLCV 欄位 (捨棄股利、分割等欄位)"""
+        columns = [c for c in OHLCV_COLUMNS if c in df.columns]
+        return df[columns] if len(columns) < len(df.columns) else df
+
+    @staticmethod
+    def last_bar_key(data: pd.DataFrame) -> Tuple:
+        """
+        最後一根 K 棒的識別值，作為分析結果快取鍵的一部分
+
+        盤中當日 K 棒時間戳不變但價量持續更新，因此一併納入收盤價與成交量。
+
+        Args:
+            data: OHLCV 數據
+
+        Returns:
+            (時間戳, 收盤價, 成交量, 筆數)
+        """
+        volume = data['Volume'].to_numpy(copy=False)[-1] if 'Volume' in data.columns else None
+        return (data.index[-1], data['Close'].to_numpy(copy=False)[-1], volume, len(data))
 
     def get_stock_data(
         self,
@@ -41,30 +431,156 @@ class DataFetcher:
         cache_key = f"{symbol}_{period}_{interval}"
 
         # 檢查快取
-        if cache_key in self.cache:
-            if datetime.now() < self.cache_expiry.get(cache_key, datetime.min):
-                logger.debug(f"使用快取數據: {symbol}")
-                return self.cache[cache_key]
-
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            # 快取命中為最熱路徑，DEBUG 未啟用時完全略過日誌呼叫
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("使用快取數據: %s", symbol)
+            return cached
+
+        # 同一股票已有其他執行緒在下載時等待其結果，不重複發出請求
+        with self._cache_lock:
+            future = self._inflight.get(cache_key)
+            owner = future is None
+            if owner:
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    return cached
+                future = self._inflight[cache_key] = Future()
+
+        if not owner:
+            return future.result()
+
+        df = None
+        try:
+            df = self._download_stock_data(symbol, period, interval, cache_key)
+        finally:
+            with self._cache_lock:
+                del self._inflight[cache_key]
+            future.set_result(df)
+        return df
+
+    def _download_stock_data(
+        self,
+        symbol: str,
+        period: str,
+        interval: str,
+        cache_key: str
+    ) -> Optional[pd.DataFrame]:
+        """下載歷史數據並寫入快取 (get_stock_data 快取未命中時呼叫)"""
         try:
-            ticker = yf.Ticker(symbol)
-            df = ticker.history(period=period, interval=interval)
+            # 僅保留 OHLCV 欄位，縮小快取與磁碟佔用
+            df = self._fetch_history(symbol, period, interval)
 
             if df.empty:
-                logger.warning(f"無法獲取數據: {symbol}")
+                logger.warning("無法獲取數據: %s", symbol)
                 return None
 
             # 更新快取
-            self.cache[cache_key] = df
-            self.cache_expiry[cache_key] = datetime.now() + self.cache_duration
+            self._set_cached(cache_key, df)
 
-            logger.info(f"成功獲取數據: {symbol}, 共 {len(df)} 筆")
+            logger.info("成功獲取數據: %s, 共 %d 筆", symbol, len(df))
             return df
 
+        except YFRateLimitError as e:
+            logger.warning("獲取 %s 數據時遭 Yahoo 限流: %s", symbol, e)
+            with self._cache_lock:
+                self._rate_limited.add(cache_key)
+            return None
+
         except Exception as e:
-            logger.error(f"獲取 {symbol} 數據時發生錯誤: {e}")
+            logger.error("獲取 %s 數據時發生錯誤: %s", symbol, e)
             return None
 
+    def consume_rate_limit(
+        self,
+        symbol: str,
+        period: str = "3mo",
+        interval: str = "1d"
+    ) -> bool:
+        """
+        查詢最近一次下載是否因 Yahoo 限流 (429) 而失敗，並清除該標記
+
+        Args:
+            symbol: 股票代碼
+            period: 時間範圍
+            interval: 時間間隔
+
+        Returns:
+            是否遭限流
+        """
+        cache_key = f"{symbol}_{period}_{interval}"
+        with self._cache_lock:
+            if cache_key in self._rate_limited:
+                self._rate_limited.discard(cache_key)
+                return True
+        return False
+
+    def get_stock_arrays(
+        self,
+        symbol: str,
+        period: str = "3mo",
+        interval: str = "1d"
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """
+        獲取單一股票的 OHLCV 欄位陣列 (float32)
+
+        Args:
+            symbol: 股票代碼
+            period: 時間範圍
+            interval: 時間間隔
+
+        Returns:
+            {"open", "high", "low", "close", "volume"} 對應的 float32 陣列
+        """
+        cache_key = f"{symbol}_{period}_{interval}"
+
+        with self._cache_lock:
+            arrays = self.array_cache.get(cache_key)
+        if arrays is not None:
+            return arrays
+
+        df = self.get_stock_data(symbol, period, interval)
+        if df is None:
+            return None
+
+        arrays = {
+            column.lower(): df[column].to_numpy(dtype=np.float32)
+            for column in OHLCV_COLUMNS
+        }
+        with self._cache_lock:
+            self.array_cache[cache_key] = arrays
+        return arrays
+
+    def get_stock_table(
+        self,
+        symbol: str,
+        period: str = "3mo",
+        interval: str = "1d"
+    ) -> Optional["pa.Table"]:
+        """
+        獲取單一股票的 OHLCV 欄式 Arrow Table (需安裝 pyarrow)
+
+        數值欄位由快取中的 DataFrame 轉換而來，各欄為單一 chunk，
+        column(...).to_numpy() 可零拷貝取得 NumPy 陣列。
+
+        Args:
+            symbol: 股票代碼
+            period: 時間範圍
+            interval: 時間間隔
+
+        Returns:
+            pyarrow.Table，無法取得數據或未安裝 pyarrow 時為 None
+        """
+        if pa is None:
+            logger.warning("未安裝 pyarrow，無法提供 Arrow Table")
+            return None
+
+        df = self.get_stock_data(symbol, period, interval)
+        if df is None:
+            return None
+        return pa.Table.from_pandas(df, preserve_index=True)
+
     def get_multiple_stocks(
         self,
         symbols: List[str],
@@ -84,14 +600,157 @@ class DataFetcher:
         """
         results = {}
 
-        for symbol in symbols:
-            data = self.get_stock_data(symbol, period, interval)
-            if data is not None:
-                results[symbol] = data
+        if not symbols:
+            return results
+
+        # 並行抓取（網路 I/O 為主，執行緒即可重疊等待時間）
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(symbols))) as executor:
+            futures = {
+                executor.submit(self.get_stock_data, symbol, period, interval): symbol
+                for symbol in symbols
+            }
+
+            for future in as_completed(futures):
+                data = future.result()
+                if data is not None:
+                    results[futures[future]] = data
+
+        logger.info("批量獲取完成: %d/%d 支股票", len(results), len(symbols))
+        return results
+
+    def get_multiple_stocks_bulk(
+        self,
+        symbols: List[str],
+        period: str = "3mo",
+        interval: str = "1d",
+        fallback: bool = True
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        以單一 yf.download 請求批量獲取多支股票數據
+
+        已在快取中的股票不會重新下載；批量結果會寫入快取，
+        後續 get_stock_data 呼叫可直接命中。批量請求中缺漏的股票
+        預設會退回 get_multiple_stocks 逐檔抓取。
+
+        Args:
+            symbols: 股票代碼列表
+            period: 時間範圍
+            interval: 時間間隔
+            fallback: 是否逐檔重試缺漏的股票 (呼叫端自行限速重試時設為 False)
+
+        Returns:
+            字典，鍵為股票代碼，值為 DataFrame
+        """
+        results = {}
+        missing = []
+
+        for symbol in dict.fromkeys(symbols):
+            cached = self._get_cached(f"{symbol}_{period}_{interval}")
+            if cached is not None:
+                results[symbol] = cached
+            else:
+                missing.append(symbol)
+
+        if missing:
+            try:
+                # auto_adjust=True 與 Ticker.history 預設一致，確保快取內容可互換
+                with _download_lock:
+                    raw = yf.download(
+                        " ".join(missing),
+                        period=period,
+                        interval=interval,
+                        group_by="ticker",
+                        threads=True,
+                        progress=False,
+                        auto_adjust=True,
+                        session=self.session,
+                    )
+            except Exception as e:
+                logger.error("批量下載數據時發生錯誤: %s", e)
+                raw = None
+
+            fetched = []
+            if raw is not None and not raw.empty:
+                for symbol in missing:
+                    if isinstance(raw.columns, pd.MultiIndex):
+                        if symbol not in raw.columns.get_level_values(0):
+                            continue
+                        df = raw[symbol]
+                    else:
+                        # 單一股票且未回傳多層欄位
+                        df = raw
+                    df = self._select_ohlcv(df.dropna(how="all"))
+                    if df.empty:
+                        continue
+
+                    self._set_cached(f"{symbol}_{period}_{interval}", df)
+                    results[symbol] = df
+                    fetched.append(symbol)
+
+            # 批量請求中缺漏的股票，逐檔重試
+            retry = [s for s in missing if s not in results] if fallback else []
+            if retry:
+                results.update(self.get_multiple_stocks(retry, period, interval))
+
+            logger.info("批量下載完成: %d/%d 支股票", len(fetched), len(missing))
 
-        logger.info(f"批量獲取完成: {len(results)}/{len(symbols)} 支股票")
         return results
 
+    def _get_info(self, symbol: str) -> Dict:
+        """取得 Ticker.info，60 秒內重複查詢直接使用快取"""
+        with self._cache_lock:
+            info = self.info_cache.get(symbol)
+        if info is not None:
+            return info
+
+        info = self._ticker(symbol).info
+        with self._cache_lock:
+            self.info_cache[symbol] = info
+        return info
+
+    async def aget_stock_data(
+        self,
+        symbol: str,
+        period: str = "3mo",
+        interval: str = "1d"
+    ) -> Optional[pd.DataFrame]:
+        """
+        get_stock_data 的非同步版本 (於執行緒中執行阻塞的 yfinance 呼叫)
+
+        Args:
+            symbol: 股票代碼
+            period: 時間範圍
+            interval: 時間間隔
+
+        Returns:
+            DataFrame with OHLCV data
+        """
+        return await asyncio.to_thread(self.get_stock_data, symbol, period, interval)
+
+    async def aget_multiple_stocks(
+        self,
+        symbols: List[str],
+        period: str = "3mo",
+        interval: str = "1d"
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        get_multiple_stocks 的非同步版本，所有股票並行抓取
+
+        Args:
+            symbols: 股票代碼列表
+            period: 時間範圍
+            interval: 時間間隔
+
+        Returns:
+            字典，鍵為股票代碼，值為 DataFrame
+        """
+        frames = await asyncio.gather(
+            *(self.aget_stock_data(symbol, period, interval) for symbol in symbols)
+        )
+        return {
+            symbol: df for symbol, df in zip(symbols, frames) if df is not None
+        }
+
     def get_stock_info(self, symbol: str) -> Optional[Dict]:
         """
         獲取股票基本資訊
@@ -103,8 +762,7 @@ class DataFetcher:
             股票資訊字典
         """
         try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
+            info = self._get_info(symbol)
 
             return {
                 "symbol": symbol,
@@ -119,43 +777,180 @@ class DataFetcher:
                 "52_week_low": info.get("fiftyTwoWeekLow", None),
             }
         except Exception as e:
-            logger.error(f"獲取 {symbol} 資訊時發生錯誤: {e}")
+            logger.error("獲取 %s 資訊時發生錯誤: %s", symbol, e)
             return None
 
+    def _load_names(self) -> Dict[str, list]:
+        """載入持久化的股票名稱 (呼叫端需持有 _cache_lock)"""
+        if self._names is None:
+            names = {}
+            if self.use_disk_cache:
+                try:
+                    names = orjson.loads(self.names_path.read_bytes())
+                except FileNotFoundError:
+                    pass
+                except (OSError, orjson.JSONDecodeError) as e:
+                    logger.warning("讀取名稱快取失敗: %s", e)
+            self._names = names
+        return self._names
+
+    def _cached_names(self, symbols: List[str]) -> Dict[str, str]:
+        """取出未過期的快取名稱"""
+        expires = time.time() - NAME_CACHE_TTL.total_seconds()
+        with self._cache_lock:
+            store = self._load_names()
+            return {
+                symbol: entry[0]
+                for symbol in symbols
+                if (entry := store.get(symbol)) and entry[1] > expires
+            }
+
+    def _save_names(self, names: Dict[str, str]):
+        """寫入名稱快取並持久化 (先寫暫存檔再替換)"""
+        if not names:
+            return
+
+        now = time.time()
+        with self._cache_lock:
+            store = self._load_names()
+            store.update({symbol: [name, now] for symbol, name in names.items()})
+            data = orjson.dumps(store)
+
+        if not self.use_disk_cache:
+            return
+
+        tmp_path = self.names_path.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, self.names_path)
+        except OSError as e:
+            logger.warning("寫入名稱快取失敗: %s", e)
+            tmp_path.unlink(missing_ok=True)
+
+    def get_stock_names(self, symbols: List[str]) -> Dict[str, str]:
+        """
+        批量獲取股票名稱 (優先使用持久化快取，其餘並行查詢)
+
+        Args:
+            symbols: 股票代碼列表
+
+        Returns:
+            字典，鍵為股票代碼，值為名稱 (查詢失敗時為代碼本身)
+        """
+        symbols = list(dict.fromkeys(symbols))
+        names = self._cached_names(symbols)
+        missing = [symbol for symbol in symbols if symbol not in names]
+
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(missing))) as executor:
+                infos = list(executor.map(self.get_stock_info, missing))
+
+            fetched = {
+                symbol: info.get("name", symbol)
+                for symbol, info in zip(missing, infos) if info
+            }
+            self._save_names(fetched)
+            names.update(fetched)
+
+        return {symbol: names.get(symbol, symbol) for symbol in symbols}
+
+    async def aget_stock_names(
+        self,
+        symbols: List[str],
+        max_concurrency: int = 20
+    ) -> Dict[str, str]:
+        """
+        get_stock_names 的非同步版本，以信號量限制同時進行的查詢數
+
+        Args:
+            symbols: 股票代碼列表
+            max_concurrency: 同時查詢上限
+
+        Returns:
+            字典，鍵為股票代碼，值為名稱 (查詢失敗時為代碼本身)
+        """
+        symbols = list(dict.fromkeys(symbols))
+        names = self._cached_names(symbols)
+        missing = [symbol for symbol in symbols if symbol not in names]
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch_info(symbol: str) -> Optional[Dict]:
+            async with semaphore:
+                return await asyncio.to_thread(self.get_stock_info, symbol)
+
+        infos = await asyncio.gather(*(fetch_info(symbol) for symbol in missing))
+        fetched = {
+            symbol: info.get("name", symbol)
+            for symbol, info in zip(missing, infos) if info
+        }
+        await asyncio.to_thread(self._save_names, fetched)
+        names.update(fetched)
+
+        return {symbol: names.get(symbol, symbol) for symbol in symbols}
+
     def get_realtime_quote(self, symbol: str) -> Optional[Dict]:
         """
         獲取即時報價
 
+        使用 Ticker.fast_info (僅抓取報價相關欄位)，避免 Ticker.info 的完整資料請求；
+        需要本益比、殖利率等基本面資料時請改用 get_stock_info。
+
         Args:
             symbol: 股票代碼
 
         Returns:
             即時報價字典
         """
+        cache_key = f"{symbol}_quote"
+        with self._cache_lock:
+            quote = self.info_cache.get(cache_key)
+        if quote is not None:
+            return quote
+
         try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
+            fi = self._ticker(symbol).fast_info
 
-            return {
+            price = fi.last_price
+            previous_close = fi.previous_close
+            change = None
+            change_percent = None
+            if price is not None and previous_close:
+                change = price - previous_close
+                change_percent = change / previous_close * 100
+
+            quote = {
                 "symbol": symbol,
-                "price": info.get("regularMarketPrice", info.get("currentPrice")),
-                "change": info.get("regularMarketChange"),
-                "change_percent": info.get("regularMarketChangePercent"),
-                "volume": info.get("regularMarketVolume"),
-                "avg_volume": info.get("averageVolume"),
-                "day_high": info.get("regularMarketDayHigh"),
-                "day_low": info.get("regularMarketDayLow"),
-                "open": info.get("regularMarketOpen"),
-                "previous_close": info.get("regularMarketPreviousClose"),
+                "price": price,
+                "change": change,
+                "change_percent": change_percent,
+                "volume": fi.last_volume,
+                "avg_volume": fi.three_month_average_volume,
+                "day_high": fi.day_high,
+                "day_low": fi.day_low,
+                "open": fi.open,
+                "previous_close": previous_close,
             }
         except Exception as e:
-            logger.error(f"獲取 {symbol} 即時報價時發生錯誤: {e}")
+            logger.error("獲取 %s 即時報價時發生錯誤: %s", symbol, e)
             return None
 
+        with self._cache_lock:
+            self.info_cache[cache_key] = quote
+        return quote
+
     def clear_cache(self):
         """清除所有快取"""
-        self.cache.clear()
-        self.cache_expiry.clear()
+        with self._cache_lock:
+            self.cache.clear()
+            self.info_cache.clear()
+            self.array_cache.clear()
+            self._tickers.clear()
+            self._names = {}
+        if self.use_disk_cache:
+            for path in self.cache_dir.glob("*.parquet"):
+                path.unlink(missing_ok=True)
+            shutil.rmtree(self.history_dir, ignore_errors=True)
+            self.names_path.unlink(missing_ok=True)
         logger.info("快取已清除")
 
 
@@ -3,13 +3,22 @@ Discord 推播模組
 透過 Webhook 發送股市分析報告到 Discord
 """
 
+import functools
+import gzip
+import time
+from itertools import islice
+import threading
 import requests
-import json
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from dataclasses import dataclass
 import logging
 
+import orjson
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 from .market_analyzer import MarketAnalysis, TrendDirection
 from .sector_scanner import SectorAnalysis, StockAnalysis
 from .predictor import PricePrediction, MarketOutlook, PredictionDirection
@@ -19,6 +28,71 @@ from .portfolio_analyzer import PortfolioSummary, HoldingAnalysis
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# embed 顏色
+COLORS = {
+    "bullish": 0x00FF00,      # 綠色
+    "bearish": 0xFF0000,      # 紅色
+    "neutral": 0xFFFF00,      # 黃色
+    "info": 0x0099FF,         # 藍色
+    "warning": 0xFF9900,      # 橘色
+}
+
+TREND_EMOJI = {
+    TrendDirection.STRONG_BULLISH: "🚀",
+    TrendDirection.BULLISH: "📈",
+    TrendDirection.NEUTRAL: "➡️",
+    TrendDirection.BEARISH: "📉",
+    TrendDirection.STRONG_BEARISH: "💥",
+}
+
+TREND_COLORS = {
+    TrendDirection.STRONG_BULLISH: COLORS["bullish"],
+    TrendDirection.BULLISH: COLORS["bullish"],
+    TrendDirection.STRONG_BEARISH: COLORS["bearish"],
+    TrendDirection.BEARISH: COLORS["bearish"],
+}
+
+DIRECTION_EMOJI = {
+    PredictionDirection.STRONG_UP: "🚀",
+    PredictionDirection.UP: "📈",
+    PredictionDirection.NEUTRAL: "➡️",
+    PredictionDirection.DOWN: "📉",
+    PredictionDirection.STRONG_DOWN: "💥",
+}
+
+# 報告中「更新時間」的格式
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M"
+
+# 每日報告固定訊息 (模組載入時建立，每次報告只需填入日期)
+REPORT_HEADER_TEMPLATE = "# 📈 {date} 每日股市分析報告\n---"
+REPORT_DISCLAIMER = (
+    "---\n"
+    "⚠️ **免責聲明**: 以上分析僅供參考，不構成投資建議。\n"
+    "投資有風險，請依個人風險承受度審慎評估。"
+)
+REPORT_DISCLAIMER_BODY = orjson.dumps({"content": REPORT_DISCLAIMER})
+
+# Webhook 請求逾時 (連線, 讀取) 秒數
+REQUEST_TIMEOUT = (2, 5)
+
+# 每日報告主體並行建構訊息的最大執行緒數 (發送一律依序進行)
+MAX_CONCURRENT_SENDS = 3
+
+# 請求內容超過此大小 (bytes) 時以 gzip 壓縮，小訊息壓縮反而浪費 CPU
+GZIP_MIN_BYTES = 1024
+
+# Discord 單則訊息最多 10 個 embed，超過時分批發送
+MAX_EMBEDS_PER_MESSAGE = 10
+
+# 收到 429 時依 retry_after 等待後重試的次數
+RATE_LIMIT_RETRIES = 3
+
+
+@functools.lru_cache(maxsize=8)
+def _report_header_body(date_str: str) -> bytes:
+    """每日報告開頭的 JSON 內容 (同一日期只序列化一次)"""
+    return orjson.dumps({"content": REPORT_HEADER_TEMPLATE.format(date=date_str)})
+
 
 class DiscordNotifier:
     """Discord 通知發送器"""
@@ -31,82 +105,317 @@ class DiscordNotifier:
             webhook_url: Discord Webhook URL
         """
         self.webhook_url = webhook_url
-        self.colors = {
-            "bullish": 0x00FF00,      # 綠色
-            "bearish": 0xFF0000,      # 紅色
-            "neutral": 0xFFFF00,      # 黃色
-            "info": 0x0099FF,         # 藍色
-            "warning": 0xFF9900,      # 橘色
-        }
+        self.colors = COLORS
+        # 未設定 Webhook 時所有發送方法直接返回，不建構訊息內容
+        self._enabled = self._webhook_configured()
+        self._session = self._create_session()
+        # 伺服器拒絕壓縮內容時停用，後續訊息一律不壓縮 (並行發送時以鎖保護)
+        self._gzip_enabled = True
+        self._gzip_lock = threading.Lock()
+        # send_concurrently 建構訊息時，各執行緒的 send_message 改為收集內容
+        self._capture = threading.local()
+        # webhook 速率限制狀態 (依回應標頭更新，並行發送時以鎖保護)
+        self._rl_lock = threading.Lock()
+        self._rl_remaining: Optional[int] = None
+        self._rl_reset = 0.0
+
+    def _webhook_configured(self) -> bool:
+        """Webhook URL 是否已設定 (非空且非範例佔位字串)"""
+        return bool(self.webhook_url) and self.webhook_url != "YOUR_DISCORD_WEBHOOK_URL_HERE"
+
+    @property
+    def enabled(self) -> bool:
+        """是否可發送訊息"""
+        return self._enabled
+
+    def _create_session(self) -> requests.Session:
+        """建立共用 HTTP Session (keep-alive 重用與 Discord 的 TLS 連線，並對暫時性錯誤重試)"""
+        session = requests.Session()
+        # 429 由 _post 依 Discord 回傳的 retry_after 處理。
+        # allowed_methods 維持預設 (不含 POST)：webhook POST 只在連線失敗時重試，
+        # 5xx 或讀取逾時時訊息可能已建立，重送會產生重複訊息
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[500, 502, 503, 504],
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=retry)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"Content-Type": "application/json"})
+        return session
+
+    def _wait_for_rate_limit(self):
+        """目前額度用盡時等待至重置，否則預扣一次額度"""
+        while True:
+            with self._rl_lock:
+                now = time.monotonic()
+                if self._rl_remaining != 0 or now >= self._rl_reset:
+                    if self._rl_remaining:
+                        self._rl_remaining -= 1
+                    return
+                wait = self._rl_reset - now
+            logger.info("Discord 速率限制額度用盡，等待 %.2f 秒", wait)
+            time.sleep(wait)
+
+    def _update_rate_limit(self, response: requests.Response):
+        """依 X-RateLimit-* 回應標頭更新剩餘額度與重置時間"""
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset_after = response.headers.get("X-RateLimit-Reset-After")
+        if remaining is None or reset_after is None:
+            return
+        try:
+            remaining, reset_after = int(remaining), float(reset_after)
+        except ValueError:
+            return
+        with self._rl_lock:
+            self._rl_remaining = remaining
+            self._rl_reset = time.monotonic() + reset_after
+
+    @staticmethod
+    def _retry_after(response: requests.Response) -> float:
+        """429 回應建議的等待秒數 (優先使用 JSON 內容的 retry_after)"""
+        try:
+            return float(response.json()["retry_after"])
+        except (ValueError, KeyError, TypeError):
+            pass
+        try:
+            return float(response.headers.get("Retry-After", 1))
+        except ValueError:
+            return 1.0
+
+    def _post(self, body: bytes) -> requests.Response:
+        """
+        發送已序列化的 JSON 內容，遵守 webhook 速率限制並於 429 時重試
+
+        Args:
+            body: UTF-8 JSON 內容
+
+        Returns:
+            HTTP 回應
+        """
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            self._wait_for_rate_limit()
+            response = self._post_once(body)
+            self._update_rate_limit(response)
+            if response.status_code != 429 or attempt == RATE_LIMIT_RETRIES:
+                return response
+
+            retry_after = self._retry_after(response)
+            logger.warning("Discord 速率限制 (429)，%.2f 秒後重試", retry_after)
+            time.sleep(retry_after)
+        return response
+
+    def _post_once(self, body: bytes) -> requests.Response:
+        """
+        發送已序列化的 JSON 內容，較大的內容以 gzip 壓縮
+
+        Args:
+            body: UTF-8 JSON 內容
+
+        Returns:
+            HTTP 回應
+        """
+        if self._gzip_enabled and len(body) >= GZIP_MIN_BYTES:
+            response = self._session.post(
+                self.webhook_url,
+                data=gzip.compress(body, compresslevel=6),
+                headers={"Content-Encoding": "gzip"},
+                timeout=REQUEST_TIMEOUT
+            )
+            # 不支援壓縮的端點會把壓縮內容當成 JSON 解析而回應 400 (如 50109
+            # Invalid JSON)；此時改以未壓縮格式重送一次，成功才停用壓縮。
+            # 訊息本身有誤時兩次都會被拒絕，不會重複建立訊息
+            if response.status_code not in (400, 415):
+                return response
+
+            response = self._session.post(self.webhook_url, data=body, timeout=REQUEST_TIMEOUT)
+            if 200 <= response.status_code < 300:
+                with self._gzip_lock:
+                    if self._gzip_enabled:
+                        logger.warning("Discord 不接受 gzip 壓縮內容，改以未壓縮格式發送")
+                        self._gzip_enabled = False
+            return response
+
+        return self._session.post(self.webhook_url, data=body, timeout=REQUEST_TIMEOUT)
+
+    def close(self):
+        """關閉 HTTP Session 與其連線池"""
+        self._session.close()
 
     def _get_trend_emoji(self, trend: TrendDirection) -> str:
         """獲取趨勢對應的 emoji"""
-        emoji_map = {
-            TrendDirection.STRONG_BULLISH: "🚀",
-            TrendDirection.BULLISH: "📈",
-            TrendDirection.NEUTRAL: "➡️",
-            TrendDirection.BEARISH: "📉",
-            TrendDirection.STRONG_BEARISH: "💥",
-        }
-        return emoji_map.get(trend, "❓")
+        return TREND_EMOJI.get(trend, "❓")
 
     def _get_direction_emoji(self, direction: PredictionDirection) -> str:
         """獲取預測方向對應的 emoji"""
-        emoji_map = {
-            PredictionDirection.STRONG_UP: "🚀",
-            PredictionDirection.UP: "📈",
-            PredictionDirection.NEUTRAL: "➡️",
-            PredictionDirection.DOWN: "📉",
-            PredictionDirection.STRONG_DOWN: "💥",
-        }
-        return emoji_map.get(direction, "❓")
+        return DIRECTION_EMOJI.get(direction, "❓")
 
     def _get_trend_color(self, trend: TrendDirection) -> int:
         """獲取趨勢對應的顏色"""
-        if trend in [TrendDirection.STRONG_BULLISH, TrendDirection.BULLISH]:
-            return self.colors["bullish"]
-        elif trend in [TrendDirection.STRONG_BEARISH, TrendDirection.BEARISH]:
-            return self.colors["bearish"]
-        return self.colors["neutral"]
+        return TREND_COLORS.get(trend, COLORS["neutral"])
 
-    def send_message(self, content: str = None, embeds: List[Dict] = None) -> bool:
+    def send_message(
+        self,
+        content: str = None,
+        embeds: List[Dict] = None,
+        raw: Optional[bytes] = None
+    ) -> bool:
         """
         發送訊息到 Discord
 
         Args:
             content: 純文字內容
             embeds: 嵌入式訊息列表
+            raw: 已序列化的 JSON 內容 (提供時忽略 content/embeds)
 
         Returns:
             是否發送成功
         """
-        if not self.webhook_url or self.webhook_url == "YOUR_DISCORD_WEBHOOK_URL_HERE":
+        if not self._enabled:
             logger.warning("Discord Webhook URL 尚未設定")
             return False
 
-        payload = {}
-        if content:
-            payload["content"] = content
-        if embeds:
-            payload["embeds"] = embeds
+        bodies = (raw,) if raw is not None else self._iter_bodies(content, embeds)
+        captured = getattr(self._capture, "bodies", None)
+        if captured is not None:
+            # send_concurrently 的建構階段：只收集內容，稍後依序發送
+            try:
+                captured.extend(bodies)
+            except orjson.JSONEncodeError as e:
+                logger.error(f"發送 Discord 訊息失敗: {e}")
+                return False
+            return True
+
+        return self._send_bodies(bodies)
+
+    def _send_bodies(self, bodies: Iterable[bytes]) -> bool:
+        """
+        依序發送已序列化的訊息內容，任一則失敗即停止
 
+        Args:
+            bodies: UTF-8 JSON 內容
+
+        Returns:
+            是否全部發送成功
+        """
         try:
-            response = requests.post(
-                self.webhook_url,
-                json=payload,
-                headers={"Content-Type": "application/json"}
-            )
-            response.raise_for_status()
-            logger.info("Discord 訊息發送成功")
-            return True
-        except Exception as e:
+            for body in bodies:
+                response = self._post(body)
+                status = response.status_code
+                if 200 <= status < 300:
+                    continue
+                if status == 429:
+                    logger.error("發送 Discord 訊息失敗: 重試後仍受速率限制 (429)")
+                else:
+                    logger.error(f"發送 Discord 訊息失敗: HTTP {status} {response.text[:200]}")
+                return False
+        except (requests.RequestException, orjson.JSONEncodeError) as e:
             logger.error(f"發送 Discord 訊息失敗: {e}")
             return False
 
+        logger.info("Discord 訊息發送成功")
+        return True
+
+    @staticmethod
+    def _iter_bodies(content: Optional[str], embeds: Optional[List[Dict]]):
+        """
+        依 embed 上限切分訊息，逐批序列化 (同一時間只保留一批的 JSON 內容)
+
+        Args:
+            content: 純文字內容 (隨第一批發送)
+            embeds: 嵌入式訊息列表
+
+        Yields:
+            UTF-8 JSON 內容
+        """
+        embeds = embeds or []
+        for start in range(0, max(len(embeds), 1), MAX_EMBEDS_PER_MESSAGE):
+            payload = {}
+            if content and start == 0:
+                payload["content"] = content
+            batch = embeds[start:start + MAX_EMBEDS_PER_MESSAGE]
+            if batch:
+                payload["embeds"] = batch
+            # orjson 直接輸出 UTF-8 (不跳脫中文)；numpy 數值可能混入 embed 欄位
+            yield orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+
+    def send_concurrently(
+        self,
+        jobs: Sequence[Tuple[Callable[..., bool], Tuple[Any, ...]]],
+        max_workers: int = MAX_CONCURRENT_SENDS
+    ) -> List[bool]:
+        """
+        並行建構多個發送函式的訊息內容，再依 jobs 順序逐則發送
+
+        建構 (整理 embed、序列化 JSON) 在執行緒中同時進行；發送由呼叫端
+        執行緒依序完成，各區段 (含超過 embed 上限而分批的區段) 不會互相穿插。
+
+        Args:
+            jobs: (發送函式, 參數) 列表
+            max_workers: 同時建構的訊息數
+
+        Returns:
+            與 jobs 順序對應的發送結果
+        """
+        if not jobs:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs))) as executor:
+            futures = [executor.submit(self._build_bodies, func, args) for func, args in jobs]
+            built = [future.result() for future in futures]
+
+        return [bodies is not None and self._send_bodies(bodies) for bodies in built]
+
+    def _build_bodies(
+        self,
+        func: Callable[..., bool],
+        args: Tuple[Any, ...]
+    ) -> Optional[List[bytes]]:
+        """
+        執行發送函式但只收集其訊息內容，不實際發送
+
+        Args:
+            func: 發送函式 (內部呼叫 send_message)
+            args: 參數
+
+        Returns:
+            序列化後的訊息內容，建構失敗時為 None
+        """
+        self._capture.bodies = bodies = []
+        try:
+            ok = func(*args)
+        finally:
+            del self._capture.bodies
+        return bodies if ok else None
+
+    def send_report_header(self, date_str: Optional[str] = None) -> bool:
+        """
+        發送每日報告開頭
+
+        Args:
+            date_str: 報告日期 (預設為今日 YYYY-MM-DD)
+
+        Returns:
+            是否發送成功
+        """
+        date_str = date_str or datetime.now().strftime("%Y-%m-%d")
+        return self.send_message(raw=_report_header_body(date_str))
+
+    def send_disclaimer(self) -> bool:
+        """
+        發送每日報告結尾的免責聲明
+
+        Returns:
+            是否發送成功
+        """
+        return self.send_message(raw=REPORT_DISCLAIMER_BODY)
+
     def send_market_analysis(
         self,
         analyses: Dict[str, MarketAnalysis],
-        market_name: str = "市場"
+        market_name: str = "市場",
+        now_str: Optional[str] = None
     ) -> bool:
         """
         發送大盤分析報告
@@ -114,11 +423,15 @@ class DiscordNotifier:
         Args:
             analyses: 指數分析結果字典
             market_name: 市場名稱
+            now_str: 更新時間字串 (預設為目前時間，批次發送時由呼叫端傳入同一值)
 
         Returns:
             是否發送成功
         """
-        now = datetime.now().strftime("%Y-%m-%d %H:%M")
+        if not self._enabled:
+            logger.warning("Discord Webhook URL 尚未設定")
+            return False
+        now = now_str or datetime.now().strftime(TIMESTAMP_FORMAT)
 
         embeds = []
 
@@ -197,7 +510,8 @@ class DiscordNotifier:
     def send_sector_analysis(
         self,
         sector_analyses: List[SectorAnalysis],
-        market_name: str = "市場"
+        market_name: str = "市場",
+        now_str: Optional[str] = None
     ) -> bool:
         """
         發送類股分析報告
@@ -205,11 +519,15 @@ class DiscordNotifier:
         Args:
             sector_analyses: 類股分析結果列表
             market_name: 市場名稱
+            now_str: 更新時間字串 (預設為目前時間，批次發送時由呼叫端傳入同一值)
 
         Returns:
             是否發送成功
         """
-        now = datetime.now().strftime("%Y-%m-%d %H:%M")
+        if not self._enabled:
+            logger.warning("Discord Webhook URL 尚未設定")
+            return False
+        now = now_str or datetime.now().strftime(TIMESTAMP_FORMAT)
 
         embeds = []
 
@@ -240,7 +558,8 @@ class DiscordNotifier:
         embeds.append(ranking_embed)
 
         # 強勢類股詳情
-        strong_sectors = [s for s in sector_analyses if s.strength_score >= 60][:3]
+        # 已依強度排序，取到前 3 個即停止掃描
+        strong_sectors = islice((s for s in sector_analyses if s.strength_score >= 60), 3)
         for sector in strong_sectors:
             stock_lines = []
             for stock in sector.top_stocks[:3]:
@@ -271,7 +590,8 @@ class DiscordNotifier:
     def send_stock_recommendations(
         self,
         stocks: List[StockAnalysis],
-        title: str = "強勢個股推薦"
+        title: str = "強勢個股推薦",
+        now_str: Optional[str] = None
     ) -> bool:
         """
         發送個股推薦
@@ -279,11 +599,15 @@ class DiscordNotifier:
         Args:
             stocks: 個股分析列表
             title: 標題
+            now_str: 更新時間字串 (預設為目前時間，批次發送時由呼叫端傳入同一值)
 
         Returns:
             是否發送成功
         """
-        now = datetime.now().strftime("%Y-%m-%d %H:%M")
+        if not self._enabled:
+            logger.warning("Discord Webhook URL 尚未設定")
+            return False
+        now = now_str or datetime.now().strftime(TIMESTAMP_FORMAT)
 
         embeds = []
 
@@ -356,6 +680,9 @@ class DiscordNotifier:
         Returns:
             是否發送成功
         """
+        if not self._enabled:
+            logger.warning("Discord Webhook URL 尚未設定")
+            return False
         emoji = self._get_direction_emoji(prediction.predicted_direction)
 
         if prediction.predicted_direction in [PredictionDirection.STRONG_UP, PredictionDirection.UP]:
@@ -426,17 +753,22 @@ class DiscordNotifier:
 
     def send_market_outlook(
         self,
-        outlook: MarketOutlook
+        outlook: MarketOutlook,
+        now_str: Optional[str] = None
     ) -> bool:
         """
         發送市場展望
 
         Args:
             outlook: 市場展望
+            now_str: 更新時間字串 (預設為目前時間，批次發送時由呼叫端傳入同一值)
 
         Returns:
             是否發送成功
         """
+        if not self._enabled:
+            logger.warning("Discord Webhook URL 尚未設定")
+            return False
         emoji = self._get_direction_emoji(outlook.overall_direction)
 
         if outlook.overall_direction in [PredictionDirection.STRONG_UP, PredictionDirection.UP]:
@@ -446,7 +778,7 @@ class DiscordNotifier:
         else:
             color = self.colors["neutral"]
 
-        now = datetime.now().strftime("%Y-%m-%d %H:%M")
+        now = now_str or datetime.now().strftime(TIMESTAMP_FORMAT)
 
         observations = "\n".join([f"• {o}" for o in outlook.key_observations])
         bullish = "\n".join([f"• {b}" for b in outlook.bullish_factors]) or "無"
@@ -500,17 +832,25 @@ class DiscordNotifier:
 
         return self.send_message(embeds=[embed])
 
-    def send_cycle_analysis(self, analysis: CycleAnalysis) -> bool:
+    def send_cycle_analysis(
+        self,
+        analysis: CycleAnalysis,
+        now_str: Optional[str] = None
+    ) -> bool:
         """
         發送景氣循環分析儀表板
 
         Args:
             analysis: CycleAnalysis 分析結果
+            now_str: 更新時間字串 (預設為目前時間，批次發送時由呼叫端傳入同一值)
 
         Returns:
             是否發送成功
         """
-        now = datetime.now().strftime("%Y-%m-%d %H:%M")
+        if not self._enabled:
+            logger.warning("Discord Webhook URL 尚未設定")
+            return False
+        now = now_str or datetime.now().strftime(TIMESTAMP_FORMAT)
         color = PHASE_COLORS.get(analysis.phase, self.colors["info"])
 
         # 分類指標
@@ -577,17 +917,22 @@ class DiscordNotifier:
     def send_discovery_report(
         self,
         discoveries: Dict[str, List[StockAnalysis]],
+        now_str: Optional[str] = None,
     ) -> bool:
         """
         發送市場雷達（動態發現）報告
 
         Args:
             discoveries: {"tw": [StockAnalysis, ...], "us": [...]}
+            now_str: 更新時間字串 (預設為目前時間，批次發送時由呼叫端傳入同一值)
 
         Returns:
             是否發送成功
         """
-        now = datetime.now().strftime("%Y-%m-%d %H:%M")
+        if not self._enabled:
+            logger.warning("Discord Webhook URL 尚未設定")
+            return False
+        now = now_str or datetime.now().strftime(TIMESTAMP_FORMAT)
 
         all_stocks: List[StockAnalysis] = []
         for market_stocks in discoveries.values():
@@ -663,6 +1008,9 @@ class DiscordNotifier:
         Returns:
             True if sent successfully
         """
+        if not self._enabled:
+            logger.warning("Discord Webhook URL 尚未設定")
+            return False
         pnl_sign = "+" if summary.total_pnl >= 0 else ""
         gap_sign = "還差 " if summary.gap_to_target > 0 else "已超越 "
         gap_abs = abs(summary.gap_to_target)
@@ -676,13 +1024,18 @@ class DiscordNotifier:
             "─" * 25,
         ]
 
+        # 單次走訪依建議分組 (保留原持倉順序)
+        groups: Dict[str, List[HoldingAnalysis]] = {}
+        for h in summary.holdings:
+            groups.setdefault(h.recommendation, []).append(h)
+
         for rec_label, rec_code in [
             ("📈 建議加碼", "add"),
             ("📉 建議減碼", "reduce"),
             ("🗑️  建議移除", "remove"),
             ("✅ 維持", "hold"),
         ]:
-            group = [h for h in summary.holdings if h.recommendation == rec_code]
+            group = groups.get(rec_code)
             if not group:
                 continue
 
@@ -743,46 +1096,45 @@ class DiscordNotifier:
         """
         logger.warning("使用已棄用的 send_daily_report 方法，請參考 main.py 中的最新實現")
         success = True
-        now = datetime.now().strftime("%Y-%m-%d")
 
-        # 發送開頭
-        self.send_message(content=f"# 📈 {now} 每日股市分析報告\n---")
+        now = datetime.now()
+        now_str = now.strftime(TIMESTAMP_FORMAT)
+
+        jobs = []
 
         # 台股大盤分析
         if tw_index_analysis:
-            self.send_market_analysis({"^TWII": tw_index_analysis}, "台股")
+            jobs.append((self.send_market_analysis, ({"^TWII": tw_index_analysis}, "台股", now_str)))
 
         # 美股大盤分析
         if us_analyses:
-            self.send_market_analysis(us_analyses, "美股")
+            jobs.append((self.send_market_analysis, (us_analyses, "美股", now_str)))
 
         # 台股類股分析
         if tw_sectors:
-            self.send_sector_analysis(tw_sectors, "台股")
+            jobs.append((self.send_sector_analysis, (tw_sectors, "台股", now_str)))
 
         # 美股類股分析
         if us_sectors:
-            self.send_sector_analysis(us_sectors, "美股")
+            jobs.append((self.send_sector_analysis, (us_sectors, "美股", now_str)))
 
         # 市場展望
         if tw_outlook:
-            self.send_market_outlook(tw_outlook)
+            jobs.append((self.send_market_outlook, (tw_outlook, now_str)))
 
         if us_outlook:
-            self.send_market_outlook(us_outlook)
+            jobs.append((self.send_market_outlook, (us_outlook, now_str)))
 
         # 強勢個股推薦
         if top_stocks:
-            self.send_stock_recommendations(top_stocks, "今日強勢個股")
+            jobs.append((self.send_stock_recommendations, (top_stocks, "今日強勢個股", now_str)))
+
+        # 開頭、主體 (並行建構、依序發送) 與結尾
+        self.send_report_header(now.strftime("%Y-%m-%d"))
+        self.send_concurrently(jobs)
 
         # 結尾
-        self.send_message(
-            content=(
-                "---\n"
-                "⚠️ **免責聲明**: 以上分析僅供參考，不構成投資建議。\n"
-                "投資有風險，請依個人風險承受度審慎評估。"
-            )
-        )
+        self.send_disclaimer()
 
         return success
 
@@ -0,0 +1,342 @@
+"""
+技術指標運算核心
+以 NumPy 陣列為輸入的 SMA / EMA / RSI 計算，安裝 numba 時以 JIT 編譯執行
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba 為可選依賴，缺少時以純 Python 迴圈執行
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def sma(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    簡單移動平均線，前 window-1 筆為 NaN (與 pandas rolling().mean() 一致)
+
+    窗口內含 NaN 時該筆為 NaN，NaN 移出窗口後即恢復計算 (同 pandas)。
+
+    Args:
+        values: 價格序列
+        window: 均線週期
+
+    Returns:
+        float64 陣列
+    """
+    n = values.shape[0]
+    out = np.full(n, np.nan)
+    if window <= 0 or n < window:
+        return out
+
+    # 只累加非 NaN 值，另外記錄窗口內的 NaN 數量
+    total = 0.0
+    nan_count = 0
+    for i in range(n):
+        x = values[i]
+        if np.isnan(x):
+            nan_count += 1
+        else:
+            total += x
+        if i >= window:
+            old = values[i - window]
+            if np.isnan(old):
+                nan_count -= 1
+            else:
+                total -= old
+        if i >= window - 1 and nan_count == 0:
+            out[i] = total / window
+    return out
+
+
+def sma_last(values: np.ndarray, window: int) -> float:
+    """
+    只計算最新一筆簡單移動平均 (等同 sma(values, window)[-1])
+
+    Args:
+        values: 價格序列
+        window: 均線週期
+
+    Returns:
+        最後 window 筆的平均，數據不足時為 NaN
+    """
+    if window <= 0 or values.shape[0] < window:
+        return np.nan
+    return float(values[-window:].mean())
+
+
+@njit(cache=True)
+def ema(values: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    指數移動平均線 (與 pandas ewm(adjust=False).mean() 一致)
+
+    Args:
+        values: 價格序列
+        alpha: 平滑係數，span 週期對應 2 / (span + 1)
+
+    Returns:
+        float64 陣列
+    """
+    n = values.shape[0]
+    out = np.empty(n)
+    if n == 0:
+        return out
+
+    prev = float(values[0])
+    out[0] = prev
+    for i in range(1, n):
+        prev = alpha * values[i] + (1.0 - alpha) * prev
+        out[i] = prev
+    return out
+
+
+@njit(cache=True)
+def macd(values: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9):
+    """
+    MACD 指標，快線、慢線與訊號線 EMA 在同一個迴圈內更新
+    (與分別呼叫 ema 三次的結果一致)
+
+    Args:
+        values: 價格序列
+        fast: 快線週期
+        slow: 慢線週期
+        signal: 訊號線週期
+
+    Returns:
+        (MACD 線, 訊號線, 柱狀圖) 三個 float64 陣列
+    """
+    n = values.shape[0]
+    macd_line = np.empty(n)
+    signal_line = np.empty(n)
+    if n == 0:
+        return macd_line, signal_line, np.empty(0)
+
+    alpha_fast = 2.0 / (fast + 1)
+    alpha_slow = 2.0 / (slow + 1)
+    alpha_signal = 2.0 / (signal + 1)
+
+    ema_fast = float(values[0])
+    ema_slow = float(values[0])
+    sig = 0.0
+    macd_line[0] = 0.0
+    signal_line[0] = 0.0
+    for i in range(1, n):
+        ema_fast = alpha_fast * values[i] + (1.0 - alpha_fast) * ema_fast
+        ema_slow = alpha_slow * values[i] + (1.0 - alpha_slow) * ema_slow
+        m = ema_fast - ema_slow
+        sig = alpha_signal * m + (1.0 - alpha_signal) * sig
+        macd_line[i] = m
+        signal_line[i] = sig
+    return macd_line, signal_line, macd_line - signal_line
+
+
+@njit(cache=True)
+def rsi_loop(values: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    相對強弱指標，漲跌幅以簡單移動平均計算 (與原 pandas 實作一致)
+
+    逐筆迴圈版本，安裝 numba 時以 JIT 編譯後作為 rsi 使用。
+
+    Args:
+        values: 價格序列
+        period: RSI 週期
+
+    Returns:
+        float64 陣列，前 period-1 筆為 NaN
+    """
+    n = values.shape[0]
+    out = np.full(n, np.nan)
+    if period <= 0 or n < period:
+        return out
+
+    # 第一筆沒有前值，漲跌皆視為 0
+    gains = np.zeros(n)
+    losses = np.zeros(n)
+    for i in range(1, n):
+        delta = values[i] - values[i - 1]
+        if delta > 0:
+            gains[i] = delta
+        elif delta < 0:
+            losses[i] = -delta
+
+    # 逐窗加總而非累加相減，避免浮點誤差讓全漲窗口的跌幅和殘留微小正值
+    for i in range(period - 1, n):
+        gain_sum = 0.0
+        loss_sum = 0.0
+        for j in range(i - period + 1, i + 1):
+            gain_sum += gains[j]
+            loss_sum += losses[j]
+        if loss_sum > 0:
+            out[i] = 100.0 - 100.0 / (1.0 + gain_sum / loss_sum)
+        elif gain_sum > 0:
+            out[i] = 100.0
+    return out
+
+
+@njit(cache=True)
+def index_snapshot(
+    close: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    volume: np.ndarray,
+    rsi_period: int = 14,
+    macd_fast: int = 12,
+    macd_slow: int = 26,
+    macd_signal: int = 9,
+    lookback: int = 20,
+    volume_period: int = 20
+):
+    """
+    單次走訪計算大盤與個股分析所需的最新一筆指標值
+
+    結果與 sma / rsi / ema 及 MarketAnalyzer.calculate_support_resistance、
+    calculate_volume_ratio 取最後一筆相同。支撐/壓力與均量忽略 NaN (同 pandas)，
+    因此不啟用 fastmath。輸入可為 float32 陣列以減少記憶體頻寬，
+    累加與 EMA 狀態一律以 float64 計算。
+
+    Args:
+        close: 收盤價
+        high: 最高價
+        low: 最低價
+        volume: 成交量
+        rsi_period: RSI 週期
+        macd_fast: MACD 快線週期
+        macd_slow: MACD 慢線週期
+        macd_signal: MACD 訊號線週期
+        lookback: 支撐/壓力回顧天數
+        volume_period: 均量天數
+
+    Returns:
+        (sma_5, sma_20, sma_60, rsi, macd, macd_signal, macd_histogram,
+         support, resistance, volume_ratio)
+    """
+    n = close.shape[0]
+    nan = np.nan
+    if n == 0:
+        return nan, nan, nan, nan, nan, nan, nan, nan, nan, 1.0
+
+    alpha_fast = 2.0 / (macd_fast + 1)
+    alpha_slow = 2.0 / (macd_slow + 1)
+    alpha_signal = 2.0 / (macd_signal + 1)
+
+    ema_fast = float(close[0])
+    ema_slow = float(close[0])
+    signal = 0.0
+
+    sum_5 = 0.0
+    sum_20 = 0.0
+    sum_60 = 0.0
+    gain_sum = 0.0
+    loss_sum = 0.0
+
+    support = nan
+    resistance = nan
+    volume_sum = 0.0
+    volume_count = 0
+
+    sr_start = n - lookback if n > lookback else 0
+    volume_start = n - volume_period if n > volume_period else 0
+
+    for i in range(n):
+        x = float(close[i])
+
+        # 均線只需最後一個窗口
+        if i >= n - 5:
+            sum_5 += x
+        if i >= n - 20:
+            sum_20 += x
+        if i >= n - 60:
+            sum_60 += x
+
+        # RSI 最後一個窗口的漲跌幅 (第一筆沒有前值，視為 0)
+        if i >= n - rsi_period and i > 0:
+            delta = x - close[i - 1]
+            if delta > 0:
+                gain_sum += delta
+            elif delta < 0:
+                loss_sum -= delta
+
+        if i > 0:
+            ema_fast = alpha_fast * x + (1.0 - alpha_fast) * ema_fast
+            ema_slow = alpha_slow * x + (1.0 - alpha_slow) * ema_slow
+            signal = alpha_signal * (ema_fast - ema_slow) + (1.0 - alpha_signal) * signal
+
+        if i >= sr_start:
+            if not np.isnan(low[i]) and (np.isnan(support) or low[i] < support):
+                support = low[i]
+            if not np.isnan(high[i]) and (np.isnan(resistance) or high[i] > resistance):
+                resistance = high[i]
+
+        if i >= volume_start and not np.isnan(volume[i]):
+            volume_sum += volume[i]
+            volume_count += 1
+
+    sma_5 = sum_5 / 5 if n >= 5 else nan
+    sma_20 = sum_20 / 20 if n >= 20 else nan
+    sma_60 = sum_60 / 60 if n >= 60 else nan
+
+    rsi_value = nan
+    if rsi_period > 0 and n >= rsi_period:
+        if loss_sum > 0:
+            rsi_value = 100.0 - 100.0 / (1.0 + gain_sum / loss_sum)
+        elif gain_sum > 0:
+            rsi_value = 100.0
+
+    macd = ema_fast - ema_slow
+
+    volume_ratio = 1.0
+    if n >= volume_period and volume_count > 0:
+        avg_volume = volume_sum / volume_count
+        if avg_volume > 0:
+            volume_ratio = volume[n - 1] / avg_volume
+
+    return (
+        sma_5, sma_20, sma_60, rsi_value, macd, signal, macd - signal,
+        support, resistance, volume_ratio
+    )
+
+
+def rsi_vectorized(values: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    RSI 的 NumPy 向量化版本，結果與 rsi_loop 相同
+
+    每個窗口仍個別加總 (sliding_window_view)，不使用累積和相減，
+    避免全漲窗口的跌幅和殘留浮點誤差。未安裝 numba 時作為 rsi 使用。
+
+    Args:
+        values: 價格序列
+        period: RSI 週期
+
+    Returns:
+        float64 陣列，前 period-1 筆為 NaN
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = values.shape[0]
+    out = np.full(n, np.nan)
+    if period <= 0 or n < period:
+        return out
+
+    # 第一筆沒有前值，漲跌皆視為 0；NaN 比較結果為 False，同樣視為 0
+    delta = np.diff(values, prepend=values[:1])
+    gains = np.where(delta > 0, delta, 0.0)
+    losses = np.where(delta < 0, -delta, 0.0)
+
+    gain_sum = sliding_window_view(gains, period).sum(axis=1)
+    loss_sum = sliding_window_view(losses, period).sum(axis=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = 100.0 - 100.0 / (1.0 + gain_sum / loss_sum)
+    out[period - 1:] = np.where(loss_sum > 0, ratio, np.where(gain_sum > 0, 100.0, np.nan))
+    return out
+
+
+# 有 numba 時逐筆迴圈經 JIT 編譯較快，否則純 Python 迴圈遠慢於 NumPy 向量化
+rsi = rsi_loop if NUMBA_AVAILABLE else rsi_vectorized
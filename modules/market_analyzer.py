@@ -11,6 +11,7 @@ from enum import Enum
 import logging
 
 from .data_fetcher import DataFetcher
+from . import indicators
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -56,21 +57,22 @@ class MarketAnalyzer:
 
     def calculate_sma(self, data: pd.Series, period: int) -> pd.Series:
         """計算簡單移動平均線"""
-        return data.rolling(window=period).mean()
+        return pd.Series(
+            indicators.sma(data.to_numpy(dtype=np.float64), period), index=data.index
+        )
 
     def calculate_ema(self, data: pd.Series, period: int) -> pd.Series:
         """計算指數移動平均線"""
-        return data.ewm(span=period, adjust=False).mean()
+        return pd.Series(
+            indicators.ema(data.to_numpy(dtype=np.float64), 2.0 / (period + 1)),
+            index=data.index
+        )
 
     def calculate_rsi(self, data: pd.Series, period: int = 14) -> pd.Series:
         """計算 RSI 相對強弱指標"""
-        delta = data.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+        return pd.Series(
+            indicators.rsi(data.to_numpy(dtype=np.float64), period), index=data.index
+        )
 
     def calculate_macd(
         self,
@@ -80,14 +82,14 @@ class MarketAnalyzer:
         signal: int = 9
     ) -> Tuple[pd.Series, pd.Series, pd.Series]:
         """計算 MACD 指標"""
-        ema_fast = self.calculate_ema(data, fast)
-        ema_slow = self.calculate_ema(data, slow)
-
-        macd_line = ema_fast - ema_slow
-        signal_line = self.calculate_ema(macd_line, signal)
-        histogram = macd_line - signal_line
-
-        return macd_line, signal_line, histogram
+        macd_line, signal_line, histogram = indicators.macd(
+            data.to_numpy(dtype=np.float64), fast, slow, signal
+        )
+        return (
+            pd.Series(macd_line, index=data.index),
+            pd.Series(signal_line, index=data.index),
+            pd.Series(histogram, index=data.index),
+        )
 
     def calculate_support_resistance(
         self,
@@ -95,11 +97,13 @@ class MarketAnalyzer:
         lookback: int = 20
     ) -> Tuple[float, float]:
         """計算支撐與壓力位"""
-        recent_data = data.tail(lookback)
+        if data.empty:
+            return np.nan, np.nan
 
         # 簡單方法：使用近期最低點和最高點
-        support = recent_data['Low'].min()
-        resistance = recent_data['High'].max()
+        # 直接對 NumPy 切片取極值，fmin/fmax 忽略 NaN (同 pandas min/max)
+        support = np.fmin.reduce(data['Low'].to_numpy()[-lookback:])
+        resistance = np.fmax.reduce(data['High'].to_numpy()[-lookback:])
 
         return support, resistance
 
@@ -115,6 +119,26 @@ class MarketAnalyzer:
             return current_volume / avg_volume
         return 1.0
 
+    def calculate_snapshot(self, data: pd.DataFrame) -> Tuple[float, ...]:
+        """
+        單次走訪計算所有指標的最新一筆 (indicators.index_snapshot)
+
+        以 float64 計算，均線與 float64 的現價比較時不會因捨入誤差翻轉結果
+        (每檔僅數百筆，float32 省下的記憶體頻寬可忽略)。
+
+        Args:
+            data: OHLCV 數據
+
+        Returns:
+            (sma_5, sma_20, sma_60, rsi, macd, macd_signal, macd_histogram,
+             support, resistance, volume_ratio)
+        """
+        # 四個欄位一次轉換，每列為連續記憶體 (Close, High, Low, Volume)
+        ohlcv = np.ascontiguousarray(
+            data[['Close', 'High', 'Low', 'Volume']].to_numpy(dtype=np.float64).T
+        )
+        return indicators.index_snapshot(ohlcv[0], ohlcv[1], ohlcv[2], ohlcv[3])
+
     def determine_trend(
         self,
         current_price: float,
@@ -222,7 +246,8 @@ class MarketAnalyzer:
         self,
         symbol: str,
         name: str,
-        period: str = "3mo"
+        period: str = "3mo",
+        data: Optional[pd.DataFrame] = None
     ) -> Optional[MarketAnalysis]:
         """
         分析單一指數
@@ -231,37 +256,33 @@ class MarketAnalyzer:
             symbol: 指數代碼
             name: 指數名稱
             period: 分析時間範圍
+            data: 已取得的歷史數據 (省略時自行抓取)
 
         Returns:
             MarketAnalysis 分析結果
         """
-        data = self.fetcher.get_stock_data(symbol, period=period)
+        if data is None:
+            data = self.fetcher.get_stock_data(symbol, period=period)
 
         if data is None or len(data) < 60:
             logger.warning(f"數據不足，無法分析: {symbol}")
             return None
 
         try:
-            close = data['Close']
-            current_price = close.iloc[-1]
-            prev_price = close.iloc[-2]
+            # float64 收盤價欄位可直接取得 NumPy 視圖，不經 Series 索引
+            close = data['Close'].to_numpy(copy=False)
+            current_price = close[-1]
+            prev_price = close[-2]
 
             price_change = current_price - prev_price
             price_change_pct = (price_change / prev_price) * 100
 
-            # 計算技術指標
-            sma_5 = self.calculate_sma(close, 5).iloc[-1]
-            sma_20 = self.calculate_sma(close, 20).iloc[-1]
-            sma_60 = self.calculate_sma(close, 60).iloc[-1]
-            rsi = self.calculate_rsi(close).iloc[-1]
-
-            macd_line, signal_line, histogram = self.calculate_macd(close)
-            macd = macd_line.iloc[-1]
-            macd_signal = signal_line.iloc[-1]
-            macd_histogram = histogram.iloc[-1]
-
-            support, resistance = self.calculate_support_resistance(data)
-            volume_ratio = self.calculate_volume_ratio(data)
+            # 計算技術指標 (單次走訪取得所有指標的最新值)
+            (
+                sma_5, sma_20, sma_60, rsi,
+                macd, macd_signal, macd_histogram,
+                support, resistance, volume_ratio
+            ) = self.calculate_snapshot(data)
 
             # 判斷趨勢
             trend, score = self.determine_trend(
@@ -313,9 +334,12 @@ class MarketAnalyzer:
             "^SOX": "費城半導體指數"
         }
 
+        # 四個指數以單一請求批量下載，未取得者由 analyze_index 逐檔抓取
+        data = self.fetcher.get_multiple_stocks_bulk(list(indices), period="3mo")
+
         results = {}
         for symbol, name in indices.items():
-            analysis = self.analyze_index(symbol, name)
+            analysis = self.analyze_index(symbol, name, data=data.get(symbol))
             if analysis:
                 results[symbol] = analysis
 
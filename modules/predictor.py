@@ -6,11 +6,14 @@
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from enum import Enum
 from datetime import datetime, timedelta
+import threading
 import logging
 
+from cachetools import TTLCache
+
 from .data_fetcher import DataFetcher
 from .market_analyzer import MarketAnalyzer, TrendDirection
 
@@ -34,7 +37,17 @@ class PredictionDirection(Enum):
     STRONG_DOWN = "強勢下跌"
 
 
-@dataclass
+# 斐波那契回撤比例 (0% 與 100% 直接使用區間高低點)，唯讀以免被誤改
+FIB_LABELS = ('23.6%', '38.2%', '50%', '61.8%', '78.6%')
+FIB_RATIOS = np.array([0.236, 0.382, 0.5, 0.618, 0.786])
+FIB_RATIOS.setflags(write=False)
+# 上升趨勢的延伸位
+FIB_EXTENSION_LABELS = ('ext_127.2%', 'ext_161.8%')
+FIB_EXTENSION_RATIOS = np.array([0.272, 0.618])
+FIB_EXTENSION_RATIOS.setflags(write=False)
+
+
+@dataclass(slots=True)
 class PricePrediction:
     """價格預測結果"""
     symbol: str
@@ -70,6 +83,9 @@ class TrendPredictor:
     def __init__(self, fetcher: Optional[DataFetcher] = None):
         self.fetcher = fetcher or DataFetcher()
         self.analyzer = MarketAnalyzer(self.fetcher)
+        # 預測結果快取 (以最後一根 K 棒為鍵，新數據進來自然失效)
+        self._prediction_cache = TTLCache(maxsize=4096, ttl=900)
+        self._cache_lock = threading.Lock()
 
     def calculate_pivot_points(self, data: pd.DataFrame) -> Dict[str, float]:
         """
@@ -81,10 +97,11 @@ class TrendPredictor:
         Returns:
             樞紐點字典
         """
-        last_day = data.iloc[-1]
-        high = last_day['High']
-        low = last_day['Low']
-        close = last_day['Close']
+        # 直接取各欄最後一筆，避免 iloc 建立整列 Series
+        high, low, close = (
+            float(data[column].to_numpy(copy=False)[-1])
+            for column in ('High', 'Low', 'Close')
+        )
 
         pivot = (high + low + close) / 3
 
@@ -113,37 +130,25 @@ class TrendPredictor:
         Returns:
             斐波那契水平字典
         """
-        recent_data = data.tail(lookback)
-        high = recent_data['High'].max()
-        low = recent_data['Low'].min()
+        close = data['Close'].to_numpy(copy=False)
+        # fmax/fmin 與 pandas 的 max/min 一樣略過 NaN
+        high = float(np.fmax.reduce(data['High'].to_numpy(copy=False)[-lookback:]))
+        low = float(np.fmin.reduce(data['Low'].to_numpy(copy=False)[-lookback:]))
         diff = high - low
 
-        current_trend_up = data['Close'].iloc[-1] > data['Close'].iloc[-lookback]
+        current_trend_up = close[-1] > close[-lookback]
 
         if current_trend_up:
             # 上升趨勢，計算回撤位
-            return {
-                '0%': high,
-                '23.6%': high - diff * 0.236,
-                '38.2%': high - diff * 0.382,
-                '50%': high - diff * 0.5,
-                '61.8%': high - diff * 0.618,
-                '78.6%': high - diff * 0.786,
-                '100%': low,
-                'ext_127.2%': high + diff * 0.272,
-                'ext_161.8%': high + diff * 0.618
-            }
+            levels = dict(zip(FIB_LABELS, (high - diff * FIB_RATIOS).tolist()))
+            extensions = zip(
+                FIB_EXTENSION_LABELS, (high + diff * FIB_EXTENSION_RATIOS).tolist()
+            )
+            return {'0%': high, **levels, '100%': low, **dict(extensions)}
         else:
             # 下降趨勢，計算反彈位
-            return {
-                '0%': low,
-                '23.6%': low + diff * 0.236,
-                '38.2%': low + diff * 0.382,
-                '50%': low + diff * 0.5,
-                '61.8%': low + diff * 0.618,
-                '78.6%': low + diff * 0.786,
-                '100%': high
-            }
+            levels = dict(zip(FIB_LABELS, (low + diff * FIB_RATIOS).tolist()))
+            return {'0%': low, **levels, '100%': high}
 
     def analyze_price_pattern(self, data: pd.DataFrame) -> Dict[str, any]:
         """
@@ -155,21 +160,23 @@ class TrendPredictor:
         Returns:
             形態分析結果
         """
-        close = data['Close']
-        high = data['High']
-        low = data['Low']
+        # 只取尾端切片計算需要的端點值，不對整段序列做 rolling
+        close = data['Close'].to_numpy(copy=False)
+        n = len(close)
 
-        # 計算近期趨勢
-        sma_5 = close.rolling(5).mean()
-        sma_20 = close.rolling(20).mean()
+        # 計算近期趨勢 (資料不足一個窗口時為 NaN，與 rolling 相同)
+        sma_5_last = close[-5:].mean() if n >= 5 else np.nan
+        sma_5_prev = close[-6:-1].mean() if n >= 6 else np.nan
+        sma_20_last = close[-20:].mean() if n >= 20 else np.nan
+        sma_20_prev = close[-21:-1].mean() if n >= 21 else np.nan
 
         patterns = []
         signals = []
 
         # 檢查均線交叉
-        if len(close) >= 2:
-            prev_diff = sma_5.iloc[-2] - sma_20.iloc[-2]
-            curr_diff = sma_5.iloc[-1] - sma_20.iloc[-1]
+        if n >= 2:
+            prev_diff = sma_5_prev - sma_20_prev
+            curr_diff = sma_5_last - sma_20_last
 
             if prev_diff < 0 and curr_diff > 0:
                 patterns.append("黃金交叉")
@@ -179,9 +186,9 @@ class TrendPredictor:
                 signals.append(("bearish", "均線死亡交叉，短期看跌"))
 
         # 檢查突破
-        recent_high = high.tail(20).max()
-        recent_low = low.tail(20).min()
-        current_price = close.iloc[-1]
+        recent_high = np.fmax.reduce(data['High'].to_numpy(copy=False)[-20:])
+        recent_low = np.fmin.reduce(data['Low'].to_numpy(copy=False)[-20:])
+        current_price = close[-1]
 
         if current_price >= recent_high * 0.98:
             patterns.append("突破近期高點")
@@ -190,10 +197,10 @@ class TrendPredictor:
             patterns.append("跌破近期低點")
             signals.append(("bearish", "價格跌破近期低點"))
 
-        # 檢查連續漲跌
-        recent_changes = close.pct_change().tail(5)
-        up_days = (recent_changes > 0).sum()
-        down_days = (recent_changes < 0).sum()
+        # 檢查連續漲跌 (價格為正，漲跌幅正負號即價差正負號，不需相除)
+        recent_changes = np.diff(close[-6:])
+        up_days = np.count_nonzero(recent_changes > 0)
+        down_days = np.count_nonzero(recent_changes < 0)
 
         if up_days >= 4:
             patterns.append("連續上漲")
@@ -209,8 +216,10 @@ class TrendPredictor:
 
     def calculate_volatility(self, data: pd.DataFrame, period: int = 20) -> float:
         """計算波動率"""
-        returns = data['Close'].pct_change().tail(period)
-        return returns.std() * np.sqrt(252) * 100  # 年化波動率 %
+        # 只取最後 period+1 筆收盤價計算日報酬，不對整段序列做 pct_change
+        close = data['Close'].to_numpy(copy=False)[-(period + 1):]
+        returns = np.diff(close) / close[:-1]
+        return np.nanstd(returns, ddof=1) * np.sqrt(252) * 100  # 年化波動率 %
 
     def predict_stock(
         self,
@@ -236,17 +245,23 @@ class TrendPredictor:
         if data is None or len(data) < 60:
             return None
 
+        # 同一根 K 棒已預測過時直接沿用，只替換名稱與時間範圍
+        cache_key = (symbol, period, DataFetcher.last_bar_key(data))
+        with self._cache_lock:
+            cached = self._prediction_cache.get(cache_key)
+        if cached is not None:
+            return replace(cached, name=name, time_horizon=horizon)
+
         try:
             close = data['Close']
             current_price = close.iloc[-1]
 
-            # 計算技術指標
-            sma_20 = self.analyzer.calculate_sma(close, 20).iloc[-1]
-            sma_60 = self.analyzer.calculate_sma(close, 60).iloc[-1]
-            rsi = self.analyzer.calculate_rsi(close).iloc[-1]
-
-            macd_line, signal_line, histogram = self.analyzer.calculate_macd(close)
-            macd_hist = histogram.iloc[-1]
+            # 計算技術指標 (單次走訪取得所有指標的最新值)
+            (
+                _, sma_20, sma_60, rsi,
+                _, _, macd_hist,
+                _, _, _
+            ) = self.analyzer.calculate_snapshot(data)
 
             # 計算支撐壓力
             pivots = self.calculate_pivot_points(data)
@@ -271,24 +286,27 @@ class TrendPredictor:
             )
 
             # 整理支撐壓力位
-            support_levels = sorted([
+            # 四個候選價位中取最低/最高三個 (部分排序即可)
+            supports = np.array([
                 pivots['s1'], pivots['s2'],
                 fib_levels.get('38.2%', current_price * 0.95),
                 fib_levels.get('50%', current_price * 0.93)
-            ])[:3]
+            ])
+            support_levels = np.sort(np.partition(supports, 2)[:3]).tolist()
 
-            resistance_levels = sorted([
+            resistances = np.array([
                 pivots['r1'], pivots['r2'],
                 fib_levels.get('38.2%', current_price * 1.05),
                 fib_levels.get('50%', current_price * 1.07)
-            ], reverse=True)[:3]
+            ])
+            resistance_levels = np.sort(np.partition(resistances, 1)[1:])[::-1].tolist()
 
             # 風險警告
             risk_warning = self._generate_risk_warning(
                 rsi, volatility, direction
             )
 
-            return PricePrediction(
+            prediction = PricePrediction(
                 symbol=symbol,
                 name=name,
                 current_price=current_price,
@@ -307,6 +325,10 @@ class TrendPredictor:
             logger.error(f"預測 {symbol} 時發生錯誤: {e}")
             return None
 
+        with self._cache_lock:
+            self._prediction_cache[cache_key] = prediction
+        return prediction
+
     def _evaluate_prediction(
         self,
         current_price: float,
@@ -492,16 +514,24 @@ class TrendPredictor:
 
         # 從類股分析提取
         if sector_analyses:
-            strong_sectors = [s for s in sector_analyses if s.strength_score >= 60]
-            weak_sectors = [s for s in sector_analyses if s.strength_score <= 40]
-
-            if len(strong_sectors) > len(sector_analyses) / 2:
-                bullish_factors.append(f"{len(strong_sectors)}個類股表現強勢")
-            if len(weak_sectors) > len(sector_analyses) / 2:
-                bearish_factors.append(f"{len(weak_sectors)}個類股表現疲弱")
-
-            if strong_sectors:
-                top_sectors = ", ".join([s.name for s in strong_sectors[:3]])
+            # 單次取出強度分數，以遮罩計數
+            strengths = np.fromiter(
+                (s.strength_score for s in sector_analyses),
+                dtype=np.float64, count=len(sector_analyses)
+            )
+            strong_idx = np.flatnonzero(strengths >= 60)
+            strong_count = len(strong_idx)
+            weak_count = int(np.count_nonzero(strengths <= 40))
+
+            if strong_count > len(sector_analyses) / 2:
+                bullish_factors.append(f"{strong_count}個類股表現強勢")
+            if weak_count > len(sector_analyses) / 2:
+                bearish_factors.append(f"{weak_count}個類股表現疲弱")
+
+            if strong_count:
+                # 強度最高的三個強勢類股 (穩定排序，同分維持原順序)
+                top_idx = strong_idx[np.argsort(-strengths[strong_idx], kind='stable')[:3]]
+                top_sectors = ", ".join(sector_analyses[i].name for i in top_idx)
                 observations.append(f"強勢類股: {top_sectors}")
 
         # 綜合判斷
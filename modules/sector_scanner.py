@@ -6,18 +6,44 @@
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, field
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field, replace
+from datetime import timedelta
+from pathlib import Path
+import asyncio
+import heapq
+import itertools
+import math
+import operator
+import sqlite3
+import threading
+import time
 import logging
 
-from .data_fetcher import DataFetcher
+import orjson
+from cachetools import TTLCache
+
+from .data_fetcher import DataFetcher, DEFAULT_CACHE_DIR
 from .market_analyzer import MarketAnalyzer, TrendDirection
+from . import indicators
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 個股分析磁碟快取版本，分析邏輯變更時遞增使舊結果失效
+ANALYSIS_CACHE_VERSION = 2
+# 磁碟快取保留時間 (鍵含最後一根 K 棒，新數據進來即不再命中，只需定期清除)
+ANALYSIS_CACHE_RETENTION = timedelta(days=3)
+
+# StockAnalysis 中的浮點欄位 (寫入磁碟快取前須皆為有限值)
+ANALYSIS_FLOAT_FIELDS = (
+    "current_price", "price_change_pct", "volume_ratio", "rsi", "strength_score",
+)
+
+# 依強度分數排序的鍵 (C 實作的屬性取值，比 lambda 快)
+_by_strength = operator.attrgetter("strength_score")
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class StockAnalysis:
     """個股分析結果"""
     symbol: str
@@ -33,7 +59,7 @@ class StockAnalysis:
     analysis_note: str
 
 
-@dataclass
+@dataclass(slots=True)
 class SectorAnalysis:
     """類股分析結果"""
     name: str
@@ -48,15 +74,140 @@ class SectorAnalysis:
 class SectorScanner:
     """強勢類股與個股掃描器"""
 
-    def __init__(self, fetcher: Optional[DataFetcher] = None):
+    def __init__(
+        self,
+        fetcher: Optional[DataFetcher] = None,
+        cache_dir: Optional[str] = None,
+        use_disk_cache: bool = True
+    ):
+        """
+        初始化掃描器
+
+        Args:
+            fetcher: 數據抓取器
+            cache_dir: 分析結果磁碟快取目錄 (預設 ~/.cache/stockbot)
+            use_disk_cache: 是否將分析結果保存於磁碟，供重啟後沿用
+        """
         self.fetcher = fetcher or DataFetcher()
         self.analyzer = MarketAnalyzer(self.fetcher)
+        # 個股分析結果快取 (以最後一根 K 棒為鍵，新數據進來自然失效)
+        self._analysis_cache = TTLCache(maxsize=4096, ttl=900)
+        self._cache_lock = threading.Lock()
+        # SQLite 連線跨執行緒共用，磁碟讀寫另以獨立的鎖串行化，不阻塞記憶體快取查詢
+        self._db_lock = threading.Lock()
+        self._db = None
+        if use_disk_cache:
+            self._db = self._open_analysis_db(Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR)
+
+    def _open_analysis_db(self, cache_dir: Path) -> Optional[sqlite3.Connection]:
+        """開啟分析結果磁碟快取 (SQLite)，並清除超過保留時間的紀錄"""
+        path = cache_dir / "analysis.sqlite"
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(path), timeout=5, check_same_thread=False)
+            # 快取可隨時重建，不需每次寫入都同步到磁碟
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=OFF")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS stock_analysis ("
+                "key TEXT PRIMARY KEY, created REAL NOT NULL, payload BLOB NOT NULL)"
+            )
+            db.execute(
+                "DELETE FROM stock_analysis WHERE created < ?",
+                (time.time() - ANALYSIS_CACHE_RETENTION.total_seconds(),)
+            )
+            db.commit()
+            return db
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"無法開啟分析快取 {path}: {e}")
+            return None
+
+    @staticmethod
+    def _disk_key(cache_key: Tuple) -> str:
+        """記憶體快取鍵轉為磁碟快取鍵 (含版本)"""
+        symbol, period, bar_key = cache_key
+        return "|".join(
+            str(part) for part in (ANALYSIS_CACHE_VERSION, symbol, period, *bar_key)
+        )
+
+    def _load_analysis(self, cache_key: Tuple) -> Optional[StockAnalysis]:
+        """讀取快取的分析結果 (記憶體優先，其次磁碟)"""
+        with self._cache_lock:
+            analysis = self._analysis_cache.get(cache_key)
+        if analysis is not None or self._db is None:
+            return analysis
+
+        try:
+            with self._db_lock:
+                row = self._db.execute(
+                    "SELECT payload FROM stock_analysis WHERE key = ?",
+                    (self._disk_key(cache_key),)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"讀取分析快取失敗: {e}")
+            return None
+
+        if row is None:
+            return None
+
+        analysis = StockAnalysis(**orjson.loads(row[0]))
+        with self._cache_lock:
+            self._analysis_cache[cache_key] = analysis
+        return analysis
+
+    def _save_analysis(self, cache_key: Tuple, analysis: StockAnalysis):
+        """寫入分析結果快取 (記憶體與磁碟)"""
+        with self._cache_lock:
+            self._analysis_cache[cache_key] = analysis
+        if self._db is None:
+            return
+
+        # JSON 無法表示 NaN/inf (orjson 會寫成 null)，這類結果只保留在記憶體
+        if not all(math.isfinite(getattr(analysis, name)) for name in ANALYSIS_FLOAT_FIELDS):
+            return
+
+        try:
+            payload = orjson.dumps(analysis, option=orjson.OPT_SERIALIZE_NUMPY)
+            with self._db_lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO stock_analysis VALUES (?, ?, ?)",
+                    (self._disk_key(cache_key), time.time(), payload)
+                )
+                self._db.commit()
+        except (sqlite3.Error, orjson.JSONEncodeError) as e:
+            logger.warning(f"寫入分析快取失敗: {e}")
+
+    def _prefetch(
+        self,
+        symbols: List[str],
+        period: str
+    ) -> Tuple[Dict[str, pd.DataFrame], Dict[str, str]]:
+        """
+        批量下載歷史數據，同時並行查詢股票名稱
+
+        Args:
+            symbols: 股票代碼列表
+            period: 分析期間
+
+        Returns:
+            (歷史數據字典, 名稱字典)
+        """
+        async def gather():
+            return await asyncio.gather(
+                asyncio.to_thread(self.fetcher.get_multiple_stocks_bulk, symbols, period),
+                self.fetcher.aget_stock_names(symbols)
+            )
+
+        data, names = asyncio.run(gather())
+        return data, names
 
     def analyze_stock(
         self,
         symbol: str,
         sector: str,
-        period: str = "3mo"
+        period: str = "3mo",
+        data: Optional[pd.DataFrame] = None,
+        name: Optional[str] = None
     ) -> Optional[StockAnalysis]:
         """
         分析單一個股
@@ -65,37 +216,49 @@ class SectorScanner:
             symbol: 股票代碼
             sector: 所屬類股
             period: 分析期間
+            data: 已取得的歷史數據 (省略時自行抓取)
+            name: 股票名稱 (省略時查詢股票資訊)
 
         Returns:
             StockAnalysis 分析結果
         """
-        data = self.fetcher.get_stock_data(symbol, period=period)
+        if data is None:
+            data = self.fetcher.get_stock_data(symbol, period=period)
 
         if data is None or len(data) < 20:
             return None
 
+        # 同一根 K 棒已分析過時直接沿用，只替換類股與名稱
+        cache_key = (symbol, period, DataFetcher.last_bar_key(data))
+        cached = self._load_analysis(cache_key)
+        if cached is not None:
+            return replace(
+                cached, sector=sector,
+                name=cached.name if name is None else name
+            )
+
         try:
-            close = data['Close']
-            current_price = close.iloc[-1]
+            close = data['Close'].to_numpy(copy=False)
+            current_price = close[-1]
 
             # 計算漲跌幅
             if len(close) >= 2:
-                prev_price = close.iloc[-2]
+                prev_price = close[-2]
                 price_change_pct = ((current_price - prev_price) / prev_price) * 100
             else:
                 price_change_pct = 0
 
-            # 計算技術指標
-            sma_5 = self.analyzer.calculate_sma(close, 5).iloc[-1]
-            sma_20 = self.analyzer.calculate_sma(close, 20).iloc[-1]
-            sma_60 = self.analyzer.calculate_sma(close, min(60, len(close) - 1)).iloc[-1]
-            rsi = self.analyzer.calculate_rsi(close).iloc[-1]
-
-            macd_line, signal_line, histogram = self.analyzer.calculate_macd(close)
-            macd_histogram = histogram.iloc[-1]
+            # 計算技術指標與成交量比率 (單次走訪取得所有指標的最新值)
+            (
+                sma_5, sma_20, sma_60, rsi,
+                _, _, macd_histogram,
+                _, _, volume_ratio
+            ) = self.analyzer.calculate_snapshot(data)
 
-            # 計算成交量比率
-            volume_ratio = self.analyzer.calculate_volume_ratio(data)
+            # 數據未滿 61 筆時長均線以 len-1 日計算 (21 筆時即為 20 日均線)
+            if len(close) <= 60:
+                window = len(close) - 1
+                sma_60 = sma_20 if window == 20 else indicators.sma_last(close, window)
 
             # 計算趨勢分數
             trend, trend_score = self.analyzer.determine_trend(
@@ -122,10 +285,10 @@ class SectorScanner:
             )
 
             # 獲取股票名稱
-            info = self.fetcher.get_stock_info(symbol)
-            name = info.get("name", symbol) if info else symbol
+            if name is None:
+                name = self.fetcher.get_stock_names([symbol])[symbol]
 
-            return StockAnalysis(
+            analysis = StockAnalysis(
                 symbol=symbol,
                 name=name,
                 sector=sector,
@@ -143,6 +306,9 @@ class SectorScanner:
             logger.error(f"分析 {symbol} 時發生錯誤: {e}")
             return None
 
+        self._save_analysis(cache_key, analysis)
+        return analysis
+
     def _calculate_strength_score(
         self,
         price_change_pct: float,
@@ -192,29 +358,15 @@ class SectorScanner:
         price_change_pct: float
     ) -> bool:
         """檢查是否有買入訊號"""
-        signals = 0
-
-        # 價格站上均線
-        if current_price > sma_5 > sma_20:
-            signals += 1
-
-        # RSI 在健康區間且向上
-        if 40 <= rsi <= 70:
-            signals += 1
-
-        # MACD 柱狀圖為正
-        if macd_histogram > 0:
-            signals += 1
+        signals = sum((
+            current_price > sma_5 > sma_20,     # 價格站上均線
+            40 <= rsi <= 70,                    # RSI 在健康區間且向上
+            macd_histogram > 0,                 # MACD 柱狀圖為正
+            volume_ratio > 1.2,                 # 成交量放大
+            1 <= price_change_pct <= 7,         # 漲幅適中（不追高）
+        ))
 
-        # 成交量放大
-        if volume_ratio > 1.2:
-            signals += 1
-
-        # 漲幅適中（不追高）
-        if 1 <= price_change_pct <= 7:
-            signals += 1
-
-        return signals >= 3
+        return bool(signals >= 3)
 
     def _generate_stock_note(
         self,
@@ -264,20 +416,28 @@ class SectorScanner:
         Returns:
             SectorAnalysis 類股分析結果
         """
-        stock_analyses = []
+        symbols = list(dict.fromkeys(symbols))
+
+        # 歷史數據以單一請求批量下載，名稱同時並行查詢；之後的分析只做計算
+        data, names = self._prefetch(symbols, period)
 
-        # 並行分析個股
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            futures = {
-                executor.submit(self.analyze_stock, symbol, sector_name, period): symbol
-                for symbol in symbols
-            }
+        stock_analyses = []
+        for symbol in symbols:
+            result = self.analyze_stock(
+                symbol, sector_name, period,
+                data=data.get(symbol), name=names.get(symbol)
+            )
+            if result:
+                stock_analyses.append(result)
 
-            for future in as_completed(futures):
-                result = future.result()
-                if result:
-                    stock_analyses.append(result)
+        return self._summarize_sector(sector_name, stock_analyses)
 
+    def _summarize_sector(
+        self,
+        sector_name: str,
+        stock_analyses: List[StockAnalysis]
+    ) -> SectorAnalysis:
+        """彙總個股分析結果為類股分析"""
         if not stock_analyses:
             return SectorAnalysis(
                 name=sector_name,
@@ -307,7 +467,7 @@ class SectorScanner:
         # 排序並取得強勢股
         top_stocks = sorted(
             stock_analyses,
-            key=lambda x: x.strength_score,
+            key=_by_strength,
             reverse=True
         )[:5]
 
@@ -338,13 +498,34 @@ class SectorScanner:
         """
         results = []
 
+        # 攤平並去重所有類股個股 (同一股票可能出現在多個類股)
+        unique_symbols = list(dict.fromkeys(
+            itertools.chain.from_iterable(sectors_config.values())
+        ))
+
+        # 所有類股的歷史數據一次批量下載，名稱同時一次查齊
+        data, names = self._prefetch(unique_symbols, period)
+
+        # 每支股票只分析一次；數據已預載，剩下的純運算在 GIL 下以執行緒並行沒有幫助
+        shared: Dict[str, Optional[StockAnalysis]] = {
+            symbol: self.analyze_stock(
+                symbol, "", period,
+                data=data.get(symbol), name=names.get(symbol)
+            )
+            for symbol in unique_symbols
+        }
+
         for sector_name, symbols in sectors_config.items():
             logger.info(f"掃描類股: {sector_name}")
-            analysis = self.scan_sector(sector_name, symbols, period)
-            results.append(analysis)
+            stock_analyses = [
+                replace(shared[symbol], sector=sector_name)
+                for symbol in dict.fromkeys(symbols)
+                if shared.get(symbol)
+            ]
+            results.append(self._summarize_sector(sector_name, stock_analyses))
 
         # 按強度分數排序
-        results.sort(key=lambda x: x.strength_score, reverse=True)
+        results.sort(key=_by_strength, reverse=True)
 
         return results
 
@@ -363,21 +544,16 @@ class SectorScanner:
         Returns:
             最強勢個股列表
         """
-        all_stocks = []
+        # 單次走訪去重，每支股票保留強度分數最高的一筆
+        best: Dict[str, StockAnalysis] = {}
         for sector in sector_analyses:
-            all_stocks.extend(sector.top_stocks)
-
-        # 按強度分數排序並去重
-        seen = set()
-        unique_stocks = []
-        for stock in sorted(all_stocks, key=lambda x: x.strength_score, reverse=True):
-            if stock.symbol not in seen:
-                seen.add(stock.symbol)
-                unique_stocks.append(stock)
-                if len(unique_stocks) >= top_n:
-                    break
+            for stock in sector.top_stocks:
+                current = best.get(stock.symbol)
+                if current is None or stock.strength_score > current.strength_score:
+                    best[stock.symbol] = stock
 
-        return unique_stocks
+        # 只取前 top_n 名，不排序整個列表
+        return heapq.nlargest(top_n, best.values(), key=_by_strength)
 
     def get_buy_signals(
         self,
@@ -398,7 +574,7 @@ class SectorScanner:
                 if stock.buy_signal:
                     buy_stocks.append(stock)
 
-        return sorted(buy_stocks, key=lambda x: x.strength_score, reverse=True)
+        return sorted(buy_stocks, key=_by_strength, reverse=True)
 
 
 if __name__ == "__main__":
@@ -3,18 +3,46 @@
 從 Yahoo Finance 篩選量能動能領先股，發現觀察名單以外的機會
 """
 
-import time
+import asyncio
+import functools
+import heapq
+import itertools
 import logging
-from typing import Dict, List, Optional, Set
+import operator
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, FrozenSet, Iterator, List, Optional, Tuple
 
+import numpy as np
 import yfinance as yf
 
 from .data_fetcher import DataFetcher
 from .sector_scanner import SectorScanner, StockAnalysis
+from config.settings import MARKETS
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 候選數達此門檻才以 NumPy 選取前 N 名，數量少時直接排序較快
+TOP_N_VECTORIZE_MIN = 64
+
+# Yahoo 約每分鐘 60 次請求即開始限流，預留餘裕
+REQUESTS_PER_MINUTE = 55
+# 遭限流 (429) 時的重試次數與指數退避參數 (秒)
+RATE_LIMIT_RETRIES = 3
+RATE_LIMIT_BACKOFF_BASE = 2.0
+RATE_LIMIT_BACKOFF_MAX = 60.0
+
+# 依強度分數排序的鍵 (C 實作的屬性取值，比 lambda 快)
+_by_strength = operator.attrgetter("strength_score")
+
+# 美股動能篩選器 (yfinance 預設篩選條件)
+US_SCREENERS = ("most_actives", "day_gainers")
+# 美股候選的當日成交量下限 (股)，流動性過低的個股不值得完整分析
+US_MIN_QUOTE_VOLUME = 500_000
+
 # 台股掃描宇宙：觀察名單外的主要個股，供動態篩選使用
 TW_DISCOVERY_UNIVERSE = [
     # 半導體 & IC 設計
@@ -36,6 +64,153 @@ TW_DISCOVERY_UNIVERSE = [
     "2207.TW", "9910.TW", "2633.TW", "5871.TW", "2801.TW",
     "3037.TW", "2049.TW", "6581.TW",
 ]
+TW_DISCOVERY_UNIVERSE_SET: FrozenSet[str] = frozenset(TW_DISCOVERY_UNIVERSE)
+
+
+class RateLimiter:
+    """
+    令牌桶速率限制器 (GCRA 演算法)
+
+    以「下一個令牌可用時間」表示桶狀態，預約時只在鎖內計算等待時間，
+    不與任何事件迴圈綁定，可跨多個事件迴圈與多執行緒共用。
+    """
+
+    def __init__(self, requests_per_minute: float, burst: int = 1):
+        """
+        初始化速率限制器
+
+        Args:
+            requests_per_minute: 每分鐘允許的請求數
+            burst: 允許的瞬間突發請求數
+        """
+        self.interval = 60.0 / requests_per_minute
+        self.burst = max(1, burst)
+        self._tat = time.monotonic()  # 理論到達時間
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        預約一個令牌
+
+        Returns:
+            取得令牌前需等待的秒數
+        """
+        with self._lock:
+            now = time.monotonic()
+            tat = max(self._tat, now)
+            self._tat = tat + self.interval
+            return max(0.0, tat - now - (self.burst - 1) * self.interval)
+
+    async def acquire(self):
+        """等待直到取得令牌"""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def pause(self, seconds: float):
+        """暫停發放令牌 (遭限流時退避)，之後的請求至少等待 seconds 秒"""
+        with self._lock:
+            resume = time.monotonic() + seconds + (self.burst - 1) * self.interval
+            self._tat = max(self._tat, resume)
+
+
+@functools.lru_cache(maxsize=4)
+def _watchlist_symbols(market: str) -> FrozenSet[str]:
+    """
+    觀察名單中的所有股票代碼
+
+    MARKETS 於匯入時載入一次，之後不會變動，因此結果可直接快取。
+
+    Args:
+        market: "TW" 或 "US"
+
+    Returns:
+        股票代碼集合
+    """
+    sectors = MARKETS.get(market, {}).get("sectors", {})
+    return frozenset(itertools.chain.from_iterable(sectors.values()))
+
+
+@functools.lru_cache(maxsize=1)
+def _tw_discovery_candidates() -> Tuple[str, ...]:
+    """
+    台股掃描宇宙扣除觀察名單後的候選股票
+
+    以集合差集決定成員，再依 TW_DISCOVERY_UNIVERSE 原順序排列，
+    確保分析與排序結果穩定。
+
+    Returns:
+        候選股票代碼 (依宇宙原順序)
+    """
+    remaining = TW_DISCOVERY_UNIVERSE_SET - _watchlist_symbols("TW")
+    return tuple(s for s in TW_DISCOVERY_UNIVERSE if s in remaining)
+
+
+def _select_top(results: List[StockAnalysis], top_n: int) -> List[StockAnalysis]:
+    """
+    依強度分數選出前 top_n 檔 (同分維持原順序)
+
+    候選數達 TOP_N_VECTORIZE_MIN 時以 np.partition 找出門檻分數，
+    只對入選的 top_n 檔排序；數量少時以 heapq.nlargest 維護 top_n 大小的堆積。
+
+    Args:
+        results: 分析結果
+        top_n: 回傳數量上限
+
+    Returns:
+        依強度分數排序的 StockAnalysis 列表
+    """
+    if top_n <= 0:
+        return []
+    if len(results) < TOP_N_VECTORIZE_MIN or top_n >= len(results):
+        # nlargest 與 sorted(..., reverse=True)[:top_n] 結果相同 (同分保持原順序)
+        return heapq.nlargest(top_n, results, key=_by_strength)
+
+    scores = np.fromiter(
+        (a.strength_score for a in results), dtype=np.float64, count=len(results)
+    )
+    # 第 top_n 高的分數即為入選門檻
+    threshold = np.partition(scores, len(scores) - top_n)[len(scores) - top_n]
+    above = np.flatnonzero(scores > threshold)
+    # 門檻同分者依原順序補足名額，與穩定排序的結果一致
+    tied = np.flatnonzero(scores == threshold)[:top_n - len(above)]
+    idx = np.concatenate((above, tied))
+    idx.sort()
+    idx = idx[np.argsort(-scores[idx], kind="stable")]
+    return [results[i] for i in idx]
+
+
+def _filter_momentum(results: List[StockAnalysis]) -> List[StockAnalysis]:
+    """
+    篩選量能放大且漲幅為正的個股 (維持原順序)
+
+    嚴格條件為 volume_ratio > 1.5，符合者不足 3 檔時放寬為 volume_ratio > 1.0。
+    數量達 TOP_N_VECTORIZE_MIN 時改以欄位陣列的布林遮罩一次算出兩種條件。
+
+    Args:
+        results: 依強度排序的分析結果
+
+    Returns:
+        篩選後的 StockAnalysis 列表
+    """
+    if len(results) < TOP_N_VECTORIZE_MIN:
+        # 數量少時單次走訪分成嚴格/寬鬆兩組即可
+        strict: List[StockAnalysis] = []
+        loose: List[StockAnalysis] = []
+        for s in results:
+            if s.volume_ratio > 1.0 and s.price_change_pct > 0:
+                loose.append(s)
+                if s.volume_ratio > 1.5:
+                    strict.append(s)
+        return strict if len(strict) >= 3 else loose
+
+    count = len(results)
+    volume_ratio = np.fromiter((s.volume_ratio for s in results), dtype=np.float64, count=count)
+    change_pct = np.fromiter((s.price_change_pct for s in results), dtype=np.float64, count=count)
+    loose_mask = (volume_ratio > 1.0) & (change_pct > 0)
+    strict_mask = loose_mask & (volume_ratio > 1.5)
+    mask = strict_mask if np.count_nonzero(strict_mask) >= 3 else loose_mask
+    return [results[i] for i in np.flatnonzero(mask)]
 
 
 class StockDiscovery:
@@ -45,44 +220,206 @@ class StockDiscovery:
         self,
         fetcher: Optional[DataFetcher] = None,
         scanner: Optional[SectorScanner] = None,
-        fetch_delay: float = 0.3,
+        fetch_delay: Optional[float] = None,
+        requests_per_minute: float = REQUESTS_PER_MINUTE,
+        max_concurrency: int = 8,
     ):
+        """
+        初始化發現器
+
+        Args:
+            fetcher: 數據抓取器
+            scanner: 個股掃描器
+            fetch_delay: (已棄用) 每次查詢間隔秒數，換算為 requests_per_minute = 60 / fetch_delay
+            requests_per_minute: 個別查詢 Yahoo 的速率上限 (每分鐘)
+            max_concurrency: 同時分析的股票數上限
+        """
+        if fetch_delay is not None:
+            logger.warning("fetch_delay 已棄用，請改用 requests_per_minute")
+            requests_per_minute = 60.0 / fetch_delay if fetch_delay > 0 else float("inf")
+
         self.fetcher = fetcher or DataFetcher()
         self.scanner = scanner or SectorScanner(self.fetcher)
-        self.fetch_delay = fetch_delay
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = RateLimiter(requests_per_minute, burst=max_concurrency)
 
-    def _get_watchlist_symbols(self, market: str) -> Set[str]:
+    def _get_watchlist_symbols(self, market: str) -> FrozenSet[str]:
         """取得觀察名單中的所有股票代碼"""
-        from config.settings import MARKETS
+        return _watchlist_symbols(market)
 
-        symbols: Set[str] = set()
-        market_data = MARKETS.get(market, {})
-        for sector_stocks in market_data.get("sectors", {}).values():
-            symbols.update(sector_stocks)
-        return symbols
+    @staticmethod
+    def invalidate() -> None:
+        """清除觀察名單與候選宇宙快取 (MARKETS 變動後呼叫)"""
+        _watchlist_symbols.cache_clear()
+        _tw_discovery_candidates.cache_clear()
 
-    def _analyze_candidates(
+    async def _analyze_candidates_async(
         self,
         symbols: List[str],
         sector_label: str,
         top_n: int,
     ) -> List[StockAnalysis]:
-        """逐一分析候選股票，帶速率限制"""
+        """
+        並行分析候選股票，以信號量限制同時查詢數並保留速率限制
+
+        Args:
+            symbols: 候選股票代碼
+            sector_label: 分析結果的類股標籤
+            top_n: 回傳數量上限
+
+        Returns:
+            依強度分數排序的 StockAnalysis 列表
+        """
+        # 歷史數據以單一請求批量下載，名稱同時並行查詢；
+        # 缺漏的股票不由 fetcher 逐檔重試，統一走下方受速率限制的查詢
+        data, names = await asyncio.gather(
+            asyncio.to_thread(
+                self.fetcher.get_multiple_stocks_bulk, symbols, "3mo", fallback=False
+            ),
+            self.fetcher.aget_stock_names(symbols, self.max_concurrency),
+        )
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def analyze(symbol: str) -> Optional[StockAnalysis]:
+            frame = data.get(symbol)
+            if frame is not None:
+                # 已預載數據，只剩純運算；於執行緒中進行，不阻塞需個別查詢的任務
+                return await asyncio.to_thread(
+                    self.scanner.analyze_stock,
+                    symbol, sector_label, data=frame, name=names.get(symbol)
+                )
+
+            # 批量下載缺漏的個股才個別查詢，經速率限制器發出
+            async with semaphore:
+                return await self._analyze_rate_limited(
+                    symbol, sector_label, names.get(symbol)
+                )
+
+        outcomes = await asyncio.gather(
+            *(analyze(symbol) for symbol in symbols), return_exceptions=True
+        )
+
         results: List[StockAnalysis] = []
+        for symbol, outcome in zip(symbols, outcomes):
+            if isinstance(outcome, Exception):
+                logger.warning(f"分析 {symbol} 失敗: {outcome}")
+            elif outcome and outcome.strength_score > 0:
+                results.append(outcome)
 
-        for i, symbol in enumerate(symbols):
-            analysis = self.scanner.analyze_stock(symbol, sector_label)
-            if analysis and analysis.strength_score > 0:
-                results.append(analysis)
+        return _select_top(results, top_n)
 
-            # 速率限制（最後一筆不需要等待）
-            if i < len(symbols) - 1:
-                time.sleep(self.fetch_delay)
+    async def _analyze_rate_limited(
+        self,
+        symbol: str,
+        sector_label: str,
+        name: Optional[str],
+    ) -> Optional[StockAnalysis]:
+        """
+        受速率限制地分析單一股票，遭 Yahoo 限流時指數退避後重試
 
-        results.sort(key=lambda x: x.strength_score, reverse=True)
-        return results[:top_n]
+        Args:
+            symbol: 股票代碼
+            sector_label: 分析結果的類股標籤
+            name: 股票名稱
 
-    def discover_us_movers(self, top_n: int = 10) -> List[StockAnalysis]:
+        Returns:
+            StockAnalysis 或 None
+        """
+        analysis = None
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            await self.rate_limiter.acquire()
+            analysis = await asyncio.to_thread(
+                self.scanner.analyze_stock, symbol, sector_label, name=name
+            )
+            if analysis is not None or not self.fetcher.consume_rate_limit(symbol):
+                break
+            if attempt == RATE_LIMIT_RETRIES:
+                logger.warning(f"{symbol} 持續遭 Yahoo 限流，放棄查詢")
+                break
+
+            # 暫停整個令牌桶，讓其他並行查詢一併退避
+            delay = min(RATE_LIMIT_BACKOFF_MAX, RATE_LIMIT_BACKOFF_BASE * 2 ** attempt)
+            delay += random.uniform(0, RATE_LIMIT_BACKOFF_BASE)
+            logger.warning(f"{symbol} 遭 Yahoo 限流，{delay:.1f} 秒後重試")
+            self.rate_limiter.pause(delay)
+        return analysis
+
+    @staticmethod
+    def _quote_has_momentum(quote: Dict) -> bool:
+        """
+        以篩選器報價做初步過濾，排除當日下跌或成交量過低的股票
+
+        省下這些不可能入選的個股的歷史數據查詢與技術分析；
+        報價缺少欄位時不排除，交由完整分析判斷。
+
+        Args:
+            quote: yf.screen 回傳的單筆報價
+
+        Returns:
+            是否值得進一步分析
+        """
+        change_pct = quote.get("regularMarketChangePercent")
+        if change_pct is not None and change_pct <= 0:
+            return False
+        volume = quote.get("regularMarketVolume")
+        if volume is not None and volume < US_MIN_QUOTE_VOLUME:
+            return False
+        return True
+
+    def _screener_candidates(
+        self,
+        futures: List[Tuple[str, Future]],
+    ) -> Iterator[str]:
+        """
+        依序產生篩選器結果中不重複且不在觀察名單的股票代碼
+
+        Args:
+            futures: (篩選器名稱, yf.screen 的 Future) 列表
+
+        Yields:
+            股票代碼
+        """
+        # 已見過的代碼 (含觀察名單)，跨篩選器去重皆為 O(1)
+        seen = set(self._get_watchlist_symbols("US"))
+        for screener_key, future in futures:
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.warning(f"yfinance screener '{screener_key}' 失敗: {e}")
+                continue
+            if not result or "quotes" not in result:
+                continue
+            for quote in result["quotes"]:
+                symbol = quote.get("symbol", "")
+                if symbol and symbol not in seen:
+                    seen.add(symbol)
+                    if self._quote_has_momentum(quote):
+                        yield symbol
+
+    def _us_screener_candidates(self, top_n: int) -> List[str]:
+        """
+        以 yfinance screener 取得美股候選股票 (阻塞式，於執行緒中呼叫)
+
+        Args:
+            top_n: 回傳數量上限 (候選數取其兩倍)
+
+        Returns:
+            候選股票代碼
+        """
+        # 兩個篩選器互不相依，同時發出請求；依固定順序合併以維持結果穩定
+        with ThreadPoolExecutor(max_workers=len(US_SCREENERS)) as executor:
+            futures = [
+                (screener_key, executor.submit(
+                    yf.screen, screener_key, session=self.fetcher.session
+                ))
+                for screener_key in US_SCREENERS
+            ]
+            # 限制候選數量以控制 API 用量，額滿即停止走訪報價
+            return list(itertools.islice(
+                self._screener_candidates(futures), top_n * 2
+            ))
+
+    async def adiscover_us_movers(self, top_n: int = 10) -> List[StockAnalysis]:
         """
         發現美股量能動能領先股
 
@@ -96,31 +433,17 @@ class StockDiscovery:
             依強度分數排序的 StockAnalysis 列表
         """
         logger.info("開始發現美股量能動能領先股...")
-        watchlist = self._get_watchlist_symbols("US")
-        candidates: List[str] = []
-
-        for screener_key in ("most_actives", "day_gainers"):
-            try:
-                result = yf.screen(screener_key)
-                if result and "quotes" in result:
-                    for quote in result["quotes"]:
-                        symbol = quote.get("symbol", "")
-                        if symbol and symbol not in watchlist and symbol not in candidates:
-                            candidates.append(symbol)
-            except Exception as e:
-                logger.warning(f"yfinance screener '{screener_key}' 失敗: {e}")
+        candidates = await asyncio.to_thread(self._us_screener_candidates, top_n)
 
         if not candidates:
             logger.warning("未取得任何美股候選股票")
             return []
 
-        # 限制候選數量以控制 API 用量
-        candidates = candidates[:top_n * 2]
         logger.info(f"美股候選股數: {len(candidates)}")
 
-        return self._analyze_candidates(candidates, "發現", top_n)
+        return await self._analyze_candidates_async(candidates, "發現", top_n)
 
-    def discover_tw_movers(self, top_n: int = 10) -> List[StockAnalysis]:
+    async def adiscover_tw_movers(self, top_n: int = 10) -> List[StockAnalysis]:
         """
         發現台股量能動能領先股
 
@@ -134,38 +457,24 @@ class StockDiscovery:
             依強度分數排序的 StockAnalysis 列表
         """
         logger.info("開始發現台股量能動能領先股...")
-        watchlist = self._get_watchlist_symbols("TW")
-        candidates = [s for s in TW_DISCOVERY_UNIVERSE if s not in watchlist]
+        candidates = list(_tw_discovery_candidates())
 
         if not candidates:
             logger.warning("台股掃描宇宙中無新候選股票")
             return []
 
         logger.info(f"台股候選股數: {len(candidates)}")
-        results = self._analyze_candidates(candidates, "發現", top_n * 2)
-
-        # 額外篩選：量能放大 > 1.5 且漲幅為正
-        filtered = [
-            s for s in results
-            if s.volume_ratio > 1.5 and s.price_change_pct > 0
-        ]
-
-        # 如果嚴格篩選後不足，放寬為 volume_ratio > 1.0
-        if len(filtered) < 3:
-            filtered = [
-                s for s in results
-                if s.volume_ratio > 1.0 and s.price_change_pct > 0
-            ]
+        results = await self._analyze_candidates_async(candidates, "發現", top_n * 2)
 
-        return filtered[:top_n]
+        return _filter_momentum(results)[:top_n]
 
-    def discover(
+    async def adiscover(
         self,
         market: str = "all",
         top_n: int = 10,
     ) -> Dict[str, List[StockAnalysis]]:
         """
-        執行市場發現
+        執行市場發現，台股與美股互不相依，同時進行
 
         Args:
             market: "tw", "us", 或 "all"
@@ -174,23 +483,47 @@ class StockDiscovery:
         Returns:
             {"tw": [...], "us": [...]}
         """
-        discoveries: Dict[str, List[StockAnalysis]] = {}
+        tasks: Dict[str, asyncio.Task] = {}
 
         if market in ("tw", "all"):
-            discoveries["tw"] = self.discover_tw_movers(top_n)
+            tasks["tw"] = asyncio.create_task(self.adiscover_tw_movers(top_n))
 
         if market in ("us", "all"):
-            discoveries["us"] = self.discover_us_movers(top_n)
+            tasks["us"] = asyncio.create_task(self.adiscover_us_movers(top_n))
 
-        return discoveries
+        results = await asyncio.gather(*tasks.values())
+        return dict(zip(tasks, results))
+
+    def discover_us_movers(self, top_n: int = 10) -> List[StockAnalysis]:
+        """發現美股量能動能領先股 (同步介面，見 adiscover_us_movers)"""
+        return asyncio.run(self.adiscover_us_movers(top_n))
+
+    def discover_tw_movers(self, top_n: int = 10) -> List[StockAnalysis]:
+        """發現台股量能動能領先股 (同步介面，見 adiscover_tw_movers)"""
+        return asyncio.run(self.adiscover_tw_movers(top_n))
+
+    def discover(
+        self,
+        market: str = "all",
+        top_n: int = 10,
+    ) -> Dict[str, List[StockAnalysis]]:
+        """
+        執行市場發現 (同步介面，見 adiscover)
+
+        Args:
+            market: "tw", "us", 或 "all"
+            top_n: 每個市場回傳數量上限
+
+        Returns:
+            {"tw": [...], "us": [...]}
+        """
+        return asyncio.run(self.adiscover(market, top_n))
 
 
 if __name__ == "__main__":
     import sys
     sys.path.insert(0, ".")
 
-    from config.settings import MARKETS
-
     discovery = StockDiscovery()
 
     print("\n=== 美股動態發現 ===")